@@ -209,6 +209,8 @@ namespace NeuroBrain.Common.Repositories
                     ["UserId"] = new AttributeValue { S = userId }
                 },
                 UpdateExpression = "SET IsArchived = :archived, UpdatedAt = :updatedAt",
+                // Without the condition UpdateItem would create a stub for a missing note
+                ConditionExpression = "attribute_exists(NoteId)",
                 ExpressionAttributeValues = new Dictionary<string, AttributeValue>
                 {
                     [":archived"] = new AttributeValue { BOOL = archive },
@@ -216,8 +218,15 @@ namespace NeuroBrain.Common.Repositories
                 }
             };
 
-            var response = await _dynamoDb.UpdateItemAsync(request);
-            return response.HttpStatusCode == System.Net.HttpStatusCode.OK;
+            try
+            {
+                var response = await _dynamoDb.UpdateItemAsync(request);
+                return response.HttpStatusCode == System.Net.HttpStatusCode.OK;
+            }
+            catch (ConditionalCheckFailedException)
+            {
+                return false;
+            }
         }
 
         public async Task<int> GetCountAsync(string userId, bool includeArchived = false)
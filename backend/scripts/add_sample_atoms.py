@@ -1,4 +1,3 @@
-import boto3
 import random
 import uuid
 from datetime import datetime, timedelta
@@ -6,8 +5,10 @@ from typing import List, Dict, Any
 import json
 import os
 
+from dynamo_client import get_dynamodb_client
+
 # Configure AWS credentials if not already configured
-os.environ['AWS_DEFAULT_REGION'] = 'ap-southeast-1'  # Update with your region if different
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-southeast-1')  # Update with your region if different
 
 def format_iso_date(date: datetime) -> str:
     """Format datetime for DynamoDB."""
@@ -76,37 +77,13 @@ def create_sample_atoms(user_id: str, count: int) -> List[Dict[str, Any]]:
     
     return atoms
 
-def add_sample_atoms():
-    """Add sample atoms to DynamoDB."""
-    # Configuration
-    TABLE_NAME = 'Atoms'  # Table name from ReviewService
-    USER_ID = 'sample-user-1'  # Replace with actual user ID
-    NUMBER_OF_ATOMS = 10  # Reduced number of atoms for testing
-    
-    # Configure AWS credentials if not already set
-    session = boto3.Session(
-        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-        region_name=os.getenv('AWS_DEFAULT_REGION', 'ap-southeast-1')
-    )
-    
-    # Initialize DynamoDB client with the configured session
-    dynamodb = session.client('dynamodb')
-    
-    # Initialize DynamoDB client is now done above with session
-    
-    # Generate sample atoms
-    print(f"Generating {NUMBER_OF_ATOMS} sample atoms...")
-    atoms = create_sample_atoms(USER_ID, NUMBER_OF_ATOMS)
-    
-    # Add atoms to DynamoDB
-    print(f"Adding {len(atoms)} atoms to DynamoDB table '{TABLE_NAME}'...")
-    
+def put_atoms(dynamodb, table_name: str, atoms: List[Dict[str, Any]]) -> int:
+    """Put atoms one at a time, returning how many were added."""
     success_count = 0
     for atom in atoms:
         try:
             dynamodb.put_item(
-                TableName=TABLE_NAME,
+                TableName=table_name,
                 Item=atom
             )
             success_count += 1
@@ -119,6 +96,26 @@ def add_sample_atoms():
             print("Atom data that caused the error:")
             print(json.dumps(atom, indent=2))
     
+    return success_count
+
+def add_sample_atoms():
+    """Add sample atoms to DynamoDB."""
+    # Configuration
+    TABLE_NAME = 'Atoms'  # Table name from ReviewService
+    USER_ID = 'sample-user-1'  # Replace with actual user ID
+    NUMBER_OF_ATOMS = 10  # Reduced number of atoms for testing
+    
+    # Initialize DynamoDB client
+    dynamodb = get_dynamodb_client()
+    
+    # Generate sample atoms
+    print(f"Generating {NUMBER_OF_ATOMS} sample atoms...")
+    atoms = create_sample_atoms(USER_ID, NUMBER_OF_ATOMS)
+    
+    # Add atoms to DynamoDB
+    print(f"Adding {len(atoms)} atoms to DynamoDB table '{TABLE_NAME}'...")
+    success_count = put_atoms(dynamodb, TABLE_NAME, atoms)
+    
     print(f"\nSuccessfully added {success_count} out of {len(atoms)} atoms to the {TABLE_NAME} table.")
 
 if __name__ == '__main__':
@@ -1,14 +1,16 @@
-import boto3
 import random
 import uuid
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 import os
 import json
+import time
 from faker import Faker
 
+from dynamo_client import get_dynamodb_client
+
 # Configure AWS credentials if not already configured
-os.environ['AWS_DEFAULT_REGION'] = 'ap-southeast-1'  # Update with your region if different
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-southeast-1')  # Update with your region if different
 
 # Initialize Faker for realistic test data
 fake = Faker()
@@ -180,6 +182,53 @@ def log_message(message):
     timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
     print(f"[{timestamp}] {message}")
 
+def put_notes(dynamodb, table_name: str, notes: List[Dict[str, Any]]) -> int:
+    """Put notes one at a time, returning how many were added."""
+    note_count = 0
+    for i, note in enumerate(notes, 1):
+        try:
+            note_id = note.get('NoteId', {}).get('S', f'note-{i}')
+            log_message(f"Adding note {i}/{len(notes)}: {note_id}")
+            
+            # Log the note data being sent to DynamoDB
+            log_message(f"  Note data: {json.dumps(note, default=str)}")
+            
+            # Add the note to DynamoDB
+            response = dynamodb.put_item(
+                TableName=table_name,
+                Item=note,
+                ReturnConsumedCapacity='TOTAL',
+                ReturnItemCollectionMetrics='SIZE',
+                ReturnValues='NONE'
+            )
+            
+            log_message(f"  Successfully added note {note_id}")
+            log_message(f"  Consumed capacity: {response.get('ConsumedCapacity', {}).get('CapacityUnits', 'N/A')} units")
+            note_count += 1
+            
+        except dynamodb.exceptions.ConditionalCheckFailedException as e:
+            log_message(f"  Conditional check failed for note {note_id}: {str(e)}")
+        except dynamodb.exceptions.ProvisionedThroughputExceededException as e:
+            log_message(f"  Provisioned throughput exceeded for note {note_id}: {str(e)}")
+            time.sleep(1)  # Add a small delay
+        except dynamodb.exceptions.ResourceNotFoundException as e:
+            log_message(f"  Table {table_name} not found: {str(e)}")
+            break  # No point continuing if table doesn't exist
+        except Exception as e:
+            log_message(f"  Error adding note {note_id}: {str(e)}")
+            import traceback
+            log_message(f"  {traceback.format_exc()}")
+            
+            # Try to get more details about the error
+            if hasattr(e, 'response') and 'Error' in e.response:
+                log_message(f"  Error details: {e.response['Error']}")
+                if 'message' in e.response['Error']:
+                    log_message(f"  Message: {e.response['Error']['message']}")
+                if 'Code' in e.response['Error']:
+                    log_message(f"  Error code: {e.response['Error']['Code']}")
+    
+    return note_count
+
 def add_sample_data():
     """Add sample data to DynamoDB."""
     # Configuration - these should match your actual table names in DynamoDB
@@ -193,15 +242,8 @@ def add_sample_data():
     NOTES_PER_USER = 1  # 20 users * 1 note each = 20 notes
     ATOMS_PER_USER = 1  # 20 users * 1 atom each = 20 atoms
     
-    # Configure AWS session
-    session = boto3.Session(
-        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-        region_name=os.getenv('AWS_DEFAULT_REGION', 'ap-southeast-1')
-    )
-    
     # Initialize DynamoDB client
-    dynamodb = session.client('dynamodb')
+    dynamodb = get_dynamodb_client()
     
     # List all available tables
     log_message("Checking available tables in DynamoDB...")
@@ -258,48 +300,7 @@ def add_sample_data():
         
         # Add notes to DynamoDB
         log_message(f"Adding {len(notes)} notes to DynamoDB table '{TABLE_NAMES['Notes']}'...")
-        note_count = 0
-        for i, note in enumerate(notes, 1):
-            try:
-                note_id = note.get('NoteId', {}).get('S', f'note-{i}')
-                log_message(f"Adding note {i}/{len(notes)}: {note_id}")
-                
-                # Log the note data being sent to DynamoDB
-                log_message(f"  Note data: {json.dumps(note, default=str)}")
-                
-                # Add the note to DynamoDB
-                response = dynamodb.put_item(
-                    TableName=TABLE_NAMES['Notes'],
-                    Item=note,
-                    ReturnConsumedCapacity='TOTAL',
-                    ReturnItemCollectionMetrics='SIZE',
-                    ReturnValues='NONE'
-                )
-                
-                log_message(f"  Successfully added note {note_id}")
-                log_message(f"  Consumed capacity: {response.get('ConsumedCapacity', {}).get('CapacityUnits', 'N/A')} units")
-                note_count += 1
-                
-            except dynamodb.exceptions.ConditionalCheckFailedException as e:
-                log_message(f"  Conditional check failed for note {note_id}: {str(e)}")
-            except dynamodb.exceptions.ProvisionedThroughputExceededException as e:
-                log_message(f"  Provisioned throughput exceeded for note {note_id}: {str(e)}")
-                time.sleep(1)  # Add a small delay
-            except dynamodb.exceptions.ResourceNotFoundException as e:
-                log_message(f"  Table {TABLE_NAMES['Notes']} not found: {str(e)}")
-                break  # No point continuing if table doesn't exist
-            except Exception as e:
-                log_message(f"  Error adding note {note_id}: {str(e)}")
-                import traceback
-                log_message(f"  {traceback.format_exc()}")
-                
-                # Try to get more details about the error
-                if hasattr(e, 'response') and 'Error' in e.response:
-                    log_message(f"  Error details: {e.response['Error']}")
-                    if 'message' in e.response['Error']:
-                        log_message(f"  Message: {e.response['Error']['message']}")
-                    if 'Code' in e.response['Error']:
-                        log_message(f"  Error code: {e.response['Error']['Code']}")
+        note_count = put_notes(dynamodb, TABLE_NAMES['Notes'], notes)
         
         # Add atoms to DynamoDB
         log_message(f"Adding {len(atoms)} atoms to DynamoDB table '{TABLE_NAMES['Atoms']}'...")
@@ -0,0 +1,310 @@
+import argparse
+import gzip
+import json
+import os
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Iterator, Optional
+
+from dynamo_client import get_dynamodb_client
+
+TABLE_NAME = 'Notes'  # Table name from NoteRepository
+KEY_ATTRIBUTES = ('NoteId', 'UserId')  # Same key NoteRepository uses for Get/Update/Delete
+USER_FLUSH_NOTES = 500  # Notes buffered per user before appending to its cold file
+MAX_BUFFERED_NOTES = 50000  # Notes buffered across all users before flushing every buffer
+SECONDS_PER_DAY = 86400
+
+
+def log_message(message):
+    """Helper function to log messages with timestamps."""
+    timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+    print(f"[{timestamp}] {message}")
+
+
+def cold_file_path(cold_dir: str, user_id: str, run_stamp: str) -> str:
+    """Path of the cold file holding one user's notes for one tiering run."""
+    safe_user_id = user_id.replace('/', '_')
+    return os.path.join(cold_dir, safe_user_id, f'notes-{run_stamp}.jsonl.gz')
+
+
+class CapacityBudget:
+    """Throttle writes so consumed capacity stays under a WCU-per-second budget."""
+
+    def __init__(self, units_per_second: float):
+        self.units_per_second = units_per_second
+        self.started = time.monotonic()
+        self.consumed = 0.0
+
+    def consume(self, units: float):
+        if self.units_per_second <= 0:
+            return
+        self.consumed += units
+        # Sleep until the average rate since the start is back under budget
+        earliest = self.consumed / self.units_per_second
+        elapsed = time.monotonic() - self.started
+        if earliest > elapsed:
+            time.sleep(earliest - elapsed)
+
+
+def scan_archived_notes(dynamodb, cutoff: int, page_size: int) -> Iterator[Dict[str, Any]]:
+    """Stream archived notes whose last update is older than the cutoff."""
+    paginator = dynamodb.get_paginator('scan')
+    pages = paginator.paginate(
+        TableName=TABLE_NAME,
+        FilterExpression='IsArchived = :archived AND UpdatedAt < :cutoff',
+        ExpressionAttributeValues={
+            ':archived': {'BOOL': True},
+            ':cutoff': {'N': str(cutoff)}
+        },
+        PaginationConfig={'PageSize': page_size}
+    )
+    for page in pages:
+        for item in page.get('Items', []):
+            yield item
+
+
+class ColdFileWriter:
+    """Buffer cold notes per user and append them to the user's file in gzip members.
+
+    Files are only open while a buffer is flushed, so the number of users
+    with cold notes is not limited by the open file limit.
+    """
+
+    def __init__(self, cold_dir: str, run_stamp: str):
+        self.cold_dir = cold_dir
+        self.run_stamp = run_stamp
+        self.buffers: Dict[str, List[str]] = {}
+        self.buffered = 0
+        self.paths: Dict[str, str] = {}
+
+    def add(self, user_id: str, item: Dict[str, Any]):
+        lines = self.buffers.setdefault(user_id, [])
+        lines.append(json.dumps(item, separators=(',', ':')) + '\n')
+        self.buffered += 1
+        if len(lines) >= USER_FLUSH_NOTES:
+            self.flush_user(user_id)
+        elif self.buffered >= MAX_BUFFERED_NOTES:
+            self.flush()
+
+    def flush_user(self, user_id: str):
+        lines = self.buffers.pop(user_id, None)
+        if not lines:
+            return
+        path = self.paths.get(user_id)
+        if path is None:
+            path = self.paths[user_id] = cold_file_path(self.cold_dir, user_id, self.run_stamp)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Appending in 'at' mode adds a new gzip member, which gzip readers concatenate
+        with gzip.open(path, 'at', encoding='utf-8') as handle:
+            handle.writelines(lines)
+        self.buffered -= len(lines)
+
+    def flush(self):
+        for user_id in list(self.buffers):
+            self.flush_user(user_id)
+
+
+def delete_if_unchanged(dynamodb, key: Dict[str, Any], updated_at: Dict[str, Any], budget: CapacityBudget) -> bool:
+    """Delete a note only if it is still archived and unchanged since the scan."""
+    try:
+        response = dynamodb.delete_item(
+            TableName=TABLE_NAME,
+            Key=key,
+            ConditionExpression='IsArchived = :archived AND UpdatedAt = :scanned',
+            ExpressionAttributeValues={
+                ':archived': {'BOOL': True},
+                ':scanned': updated_at
+            },
+            ReturnConsumedCapacity='TOTAL'
+        )
+    except dynamodb.exceptions.ConditionalCheckFailedException:
+        # A failed condition check still costs a write
+        budget.consume(1)
+        return False
+    budget.consume(response.get('ConsumedCapacity', {}).get('CapacityUnits', 0))
+    return True
+
+
+def put_if_absent(dynamodb, item: Dict[str, Any], budget: CapacityBudget) -> bool:
+    """Put a note back only if the table has no copy of it."""
+    try:
+        response = dynamodb.put_item(
+            TableName=TABLE_NAME,
+            Item=item,
+            ConditionExpression='attribute_not_exists(NoteId)',
+            ReturnConsumedCapacity='TOTAL'
+        )
+    except dynamodb.exceptions.ConditionalCheckFailedException:
+        budget.consume(1)
+        return False
+    budget.consume(response.get('ConsumedCapacity', {}).get('CapacityUnits', 0))
+    return True
+
+
+def drop_from_cold_file(path: str, note_ids: set):
+    """Remove notes that turned hot again from a cold file."""
+    remaining = [item for item in read_cold_file(path) if item['NoteId']['S'] not in note_ids]
+    if remaining:
+        write_cold_file(path, remaining)
+    else:
+        os.remove(path)
+
+
+def tier_archived_notes(dynamodb, cold_dir: str, older_than_days: int, max_wcu: float,
+                        page_size: int, dry_run: bool) -> Dict[str, int]:
+    """Move archived notes older than the cutoff from the hot table into per-user cold files."""
+    # Epoch seconds, the same clock ArchiveAsync writes UpdatedAt with
+    cutoff = int(time.time()) - older_than_days * SECONDS_PER_DAY
+    run_stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
+    log_message(f"Scanning '{TABLE_NAME}' for notes archived before {datetime.utcfromtimestamp(cutoff)}...")
+
+    # Phase 1: stream matches into compressed per-user files
+    writer = ColdFileWriter(cold_dir, run_stamp)
+    scanned: List[Dict[str, Any]] = []
+    users = set()
+    for item in scan_archived_notes(dynamodb, cutoff, page_size):
+        user_id = item['UserId']['S']
+        users.add(user_id)
+        if not dry_run:
+            writer.add(user_id, item)
+        scanned.append({
+            'key': {name: item[name] for name in KEY_ATTRIBUTES},
+            'updated_at': item['UpdatedAt']
+        })
+        if len(scanned) % 1000 == 0:
+            log_message(f"  Streamed {len(scanned)} notes so far...")
+    writer.flush()
+
+    log_message(f"Found {len(scanned)} cold notes across {len(users)} users")
+    if dry_run or not scanned:
+        return {'notes': len(scanned), 'users': len(users), 'deleted': 0, 'hot_again': 0}
+
+    # Phase 2: only delete once every cold file has been written. The delete is
+    # conditional, so a note restored or edited since the scan stays in the table.
+    budget = CapacityBudget(max_wcu)
+    deleted = 0
+    hot_again: Dict[str, set] = {}
+    for processed, note in enumerate(scanned, 1):
+        if delete_if_unchanged(dynamodb, note['key'], note['updated_at'], budget):
+            deleted += 1
+        else:
+            hot_again.setdefault(note['key']['UserId']['S'], set()).add(note['key']['NoteId']['S'])
+        if processed % 1000 == 0:
+            log_message(f"  Processed {processed}/{len(scanned)} notes...")
+
+    # Notes that changed since the scan are hot again; their cold copies are stale
+    for user_id, note_ids in hot_again.items():
+        drop_from_cold_file(writer.paths[user_id], note_ids)
+    hot_again_count = sum(len(ids) for ids in hot_again.values())
+    if hot_again_count:
+        log_message(f"  Kept {hot_again_count} notes that changed since the scan")
+
+    return {'notes': len(scanned), 'users': len(users), 'deleted': deleted, 'hot_again': hot_again_count}
+
+
+def read_cold_file(path: str) -> List[Dict[str, Any]]:
+    """Load every note stored in a cold file."""
+    with gzip.open(path, 'rt', encoding='utf-8') as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def write_cold_file(path: str, items: List[Dict[str, Any]]):
+    """Atomically replace a cold file with the given notes."""
+    tmp_path = path + '.tmp'
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as handle:
+        for item in items:
+            handle.write(json.dumps(item, separators=(',', ':')) + '\n')
+    os.replace(tmp_path, path)
+
+
+def restore_cold_notes(dynamodb, cold_dir: str, user_id: str, note_ids: Optional[List[str]],
+                       unarchive: bool, max_wcu: float) -> int:
+    """Put a user's cold notes back into the hot table.
+
+    Restored notes keep IsArchived = true unless `unarchive` is set, so they
+    show up in the archive again and RestoreNoteHandler can un-archive them
+    one at a time. RestoreNoteHandler cannot bring back a tiered note by
+    itself: it returns 404 until the note is restored here. A note that is
+    already in the table (e.g. a tier run stopped before deleting it) is
+    newer than its cold copy, so it is left as is and the copy is dropped.
+    """
+    user_dir = os.path.join(cold_dir, user_id.replace('/', '_'))
+    if not os.path.isdir(user_dir):
+        log_message(f"No cold files found for user {user_id}")
+        return 0
+
+    wanted = set(note_ids) if note_ids else None
+    budget = CapacityBudget(max_wcu)
+    now = str(int(time.time()))
+    restored = 0
+
+    for file_name in sorted(os.listdir(user_dir)):
+        if not file_name.endswith('.jsonl.gz'):
+            continue
+        path = os.path.join(user_dir, file_name)
+        items = read_cold_file(path)
+        to_restore = [item for item in items if wanted is None or item['NoteId']['S'] in wanted]
+        if not to_restore:
+            continue
+
+        for item in to_restore:
+            if unarchive:
+                # Same fields ArchiveAsync(noteId, userId, false) sets
+                item['IsArchived'] = {'BOOL': False}
+                item['UpdatedAt'] = {'N': now}
+
+        skipped = 0
+        for item in to_restore:
+            if put_if_absent(dynamodb, item, budget):
+                restored += 1
+            else:
+                skipped += 1
+                log_message(f"  Skipped {item['NoteId']['S']}: already in '{TABLE_NAME}', dropping the cold copy")
+
+        remaining = [item for item in items if wanted is not None and item['NoteId']['S'] not in wanted]
+        if remaining:
+            write_cold_file(path, remaining)
+        else:
+            os.remove(path)
+        log_message(f"  Restored {len(to_restore) - skipped} notes from {file_name}")
+
+    return restored
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Move old archived notes between the Notes table and cold storage.')
+    parser.add_argument('--cold-dir', default=os.getenv('COLD_NOTES_DIR', 'cold_notes'),
+                        help='Directory holding per-user compressed cold files')
+    parser.add_argument('--max-wcu', type=float, default=25.0,
+                        help='Write capacity units per second to spend (0 = unlimited)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    tier_parser = subparsers.add_parser('tier', help='Move archived notes into cold files')
+    tier_parser.add_argument('--older-than-days', type=int, default=90)
+    tier_parser.add_argument('--page-size', type=int, default=500)
+    tier_parser.add_argument('--dry-run', action='store_true', help='Count matching notes without writing or deleting')
+
+    restore_parser = subparsers.add_parser('restore', help='Put cold notes back into the Notes table')
+    restore_parser.add_argument('--user-id', required=True)
+    restore_parser.add_argument('--note-id', action='append', dest='note_ids',
+                                help='Restore only this note (repeatable); defaults to all of the user\'s notes')
+    restore_parser.add_argument('--unarchive', action='store_true',
+                                help='Also clear IsArchived, so the notes are active again without '
+                                     'a RestoreNoteHandler call per note')
+
+    args = parser.parse_args()
+    dynamodb = get_dynamodb_client()
+
+    if args.command == 'tier':
+        result = tier_archived_notes(dynamodb, args.cold_dir, args.older_than_days,
+                                     args.max_wcu, args.page_size, args.dry_run)
+        log_message(f"Tiering completed: {result['notes']} notes for {result['users']} users, "
+                    f"{result['deleted']} deleted from '{TABLE_NAME}', {result['hot_again']} changed since the scan")
+    else:
+        restored = restore_cold_notes(dynamodb, args.cold_dir, args.user_id, args.note_ids,
+                                      args.unarchive, args.max_wcu)
+        log_message(f"Restore completed: {restored} notes written back to '{TABLE_NAME}'")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+import os
+
+
+def get_dynamodb_client(region_name=None, config=None, record_trace=True):
+    """Create the DynamoDB client shared by the scripts.
+
+    The region is `region_name`, else AWS_DEFAULT_REGION, else whatever
+    boto3 resolves from the AWS profile. Set DYNAMODB_ENDPOINT_URL to target
+    DynamoDB Local, and DYNAMODB_TRACE_FILE to record every call the client
+    makes (see dynamo_trace.py).
+    """
+    # Imported here so commands that never reach AWS don't pay for boto3
+    import boto3
+
+    session = boto3.Session(
+        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+        # None lets boto3 fall back to AWS_PROFILE and ~/.aws/config
+        region_name=region_name or os.getenv('AWS_DEFAULT_REGION')
+    )
+    dynamodb = session.client('dynamodb', endpoint_url=os.getenv('DYNAMODB_ENDPOINT_URL'), config=config)
+
+    trace_path = os.getenv('DYNAMODB_TRACE_FILE')
+    if trace_path and record_trace:
+        from dynamo_trace import attach_recorder
+        attach_recorder(dynamodb, trace_path)
+    return dynamodb
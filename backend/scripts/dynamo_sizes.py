@@ -0,0 +1,59 @@
+"""Item sizes in DynamoDB's accounting, for items in DynamoDB JSON.
+
+Shared by the capacity planner and the trace recorder.
+"""
+import base64
+from typing import Dict, Any
+
+
+def utf8_length(value: str) -> int:
+    """Byte length of a string in UTF-8."""
+    return len(value) if value.isascii() else len(value.encode('utf-8'))
+
+
+def number_size(value: str) -> int:
+    """Size of a DynamoDB number: one byte per two significant digits plus one."""
+    digits = value.lstrip('-+').lower()
+    if 'e' in digits:
+        digits = digits.split('e', 1)[0]
+    digits = digits.replace('.', '').strip('0')
+    size = (len(digits) + 1) // 2 + 1
+    return size + 1 if value.startswith('-') else size
+
+
+def binary_size(value) -> int:
+    """Size of a binary value, decoding base64 when it comes from DynamoDB JSON."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if hasattr(value, 'value'):  # boto3 Binary wrapper
+        return len(value.value)
+    return len(base64.b64decode(value))
+
+
+def attribute_value_size(value: Dict[str, Any]) -> int:
+    """Size in bytes of one DynamoDB attribute value (without its name)."""
+    type_name, data = next(iter(value.items()))
+    if type_name == 'S':
+        return utf8_length(data)
+    if type_name == 'N':
+        return number_size(data)
+    if type_name in ('BOOL', 'NULL'):
+        return 1
+    if type_name == 'B':
+        return binary_size(data)
+    if type_name == 'SS':
+        return sum(utf8_length(element) for element in data)
+    if type_name == 'NS':
+        return sum(number_size(element) for element in data)
+    if type_name == 'BS':
+        return sum(binary_size(element) for element in data)
+    if type_name == 'L':
+        return 3 + sum(1 + attribute_value_size(element) for element in data)
+    if type_name == 'M':
+        return 3 + sum(1 + utf8_length(name) + attribute_value_size(element) for name, element in data.items())
+    raise ValueError(f"Unknown attribute type: {type_name}")
+
+
+def item_attribute_sizes(item: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+    """Size of each attribute in an item, attribute name included."""
+    return {name: utf8_length(name) + attribute_value_size(value) for name, value in item.items()}
@@ -0,0 +1,307 @@
+"""Compact binary traces of DynamoDB calls.
+
+A trace starts with a fixed header followed by a stream of records:
+
+  header  MAGIC (8 bytes), wall-clock start in epoch nanoseconds (u64)
+  string  kind=0, id (u16), length (u16), UTF-8 bytes
+  op      kind=1, op code (u8), status (u8), table id (u16), index id (u16),
+          start offset ns (u64), duration us (u32), item size (u32),
+          payload length (u32), payload (compact JSON of the key parameters)
+
+Table and index names are written once as string records and referenced by
+id afterwards. All integers are little-endian. Readers walk the file through
+mmap, so traces of millions of operations never have to fit in memory.
+
+Op records are written when a call completes, so concurrent calls appear in
+completion order rather than start order. Use in_start_order() to read them
+back sorted by start time.
+"""
+import atexit
+import heapq
+import json
+import mmap
+import struct
+import sys
+import threading
+import time
+from collections import Counter, namedtuple
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+from dynamo_sizes import item_attribute_sizes
+
+MAGIC = b'DDBTRC01'
+HEADER = struct.Struct('<8sQ')
+STRING_RECORD = struct.Struct('<BHH')
+OP_RECORD = struct.Struct('<BBBHHQIII')
+KIND_STRING = 0
+KIND_OP = 1
+NO_INDEX = 0xFFFF
+# Longest call in_start_order() can move ahead of calls that completed before it
+REORDER_WINDOW_NS = 60 * 10 ** 9
+
+OPERATIONS = [
+    'GetItem', 'PutItem', 'UpdateItem', 'DeleteItem', 'Query', 'Scan',
+    'BatchGetItem', 'BatchWriteItem', 'DescribeTable', 'ListTables',
+]
+OP_CODES = {name: code for code, name in enumerate(OPERATIONS)}
+
+STATUS_OK = 0
+STATUS_THROTTLED = 1
+STATUS_ERROR = 2
+THROTTLE_CODES = {
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+}
+
+# Request parameters kept so Query and Scan calls can be reissued as recorded;
+# ExclusiveStartKey makes later pages of a paginated read resume where they did
+READ_PARAMETERS = (
+    'KeyConditionExpression', 'FilterExpression', 'ExpressionAttributeValues',
+    'ExpressionAttributeNames', 'ProjectionExpression', 'Select', 'Limit',
+    'ScanIndexForward', 'Segment', 'TotalSegments', 'ExclusiveStartKey',
+)
+
+TraceRecord = namedtuple('TraceRecord', 'op table index start_ns end_ns status item_size payload')
+
+
+def item_size(item: Optional[Dict[str, Any]]) -> int:
+    """Size in bytes of an item in DynamoDB's accounting."""
+    return sum(item_attribute_sizes(item).values()) if item else 0
+
+
+def encode_payload(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+
+
+class TraceWriter:
+    """Append records to a trace file. Safe to share between threads."""
+
+    def __init__(self, path: str):
+        self.handle = open(path, 'wb', buffering=1 << 20)
+        self.lock = threading.Lock()
+        self.strings: Dict[str, int] = {}
+        self.origin_ns = time.perf_counter_ns()
+        self.handle.write(HEADER.pack(MAGIC, time.time_ns()))
+
+    def _string_id(self, value: str) -> int:
+        string_id = self.strings.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            data = value.encode('utf-8')
+            self.handle.write(STRING_RECORD.pack(KIND_STRING, string_id, len(data)))
+            self.handle.write(data)
+            self.strings[value] = string_id
+        return string_id
+
+    def write(self, op: str, table: str, index: Optional[str], start_ns: int, end_ns: int,
+              status: int, size: int, payload: Dict[str, Any]):
+        data = encode_payload(payload)
+        with self.lock:
+            if self.handle.closed:
+                return
+            table_id = self._string_id(table or '')
+            index_id = self._string_id(index) if index else NO_INDEX
+            self.handle.write(OP_RECORD.pack(
+                KIND_OP, OP_CODES[op], status, table_id, index_id,
+                max(0, start_ns - self.origin_ns), min((end_ns - start_ns) // 1000, 0xFFFFFFFF),
+                min(size, 0xFFFFFFFF), len(data)
+            ))
+            self.handle.write(data)
+
+    def close(self):
+        with self.lock:
+            if not self.handle.closed:
+                self.handle.close()
+
+
+class TraceRecorder:
+    """botocore event handlers that write every DynamoDB call to a trace."""
+
+    def __init__(self, writer: TraceWriter, dynamodb):
+        self.writer = writer
+        self.dynamodb = dynamodb
+        self.key_schemas: Dict[str, Optional[List[str]]] = {}
+        self.local = threading.local()
+
+    def key_attributes(self, table_name: str) -> Optional[List[str]]:
+        """Key attribute names of a table, from one describe_table call per table."""
+        if table_name not in self.key_schemas:
+            # The lookup goes through the same client; keep it out of the trace
+            self.local.describing = True
+            try:
+                table = self.dynamodb.describe_table(TableName=table_name)['Table']
+                self.key_schemas[table_name] = [key['AttributeName'] for key in table['KeySchema']]
+            except Exception:
+                self.key_schemas[table_name] = None
+            finally:
+                self.local.describing = False
+        return self.key_schemas[table_name]
+
+    def key_of(self, table_name: str, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Key attributes of an item, or the whole item if the key schema is unavailable."""
+        keys = self.key_attributes(table_name)
+        if keys is None:
+            return item
+        return {name: item[name] for name in keys if name in item}
+
+    def on_params(self, params, model, context, **kwargs):
+        if model.name in OP_CODES and not getattr(self.local, 'describing', False):
+            context['trace_op'] = model.name
+            context['trace_params'] = params
+            context['trace_start_ns'] = time.perf_counter_ns()
+
+    def on_after_call(self, parsed, model, context, **kwargs):
+        if 'trace_start_ns' not in context:
+            return
+        error_code = (parsed or {}).get('Error', {}).get('Code')
+        if error_code is None:
+            status = STATUS_OK
+        else:
+            status = STATUS_THROTTLED if error_code in THROTTLE_CODES else STATUS_ERROR
+        self._record(context, status, parsed or {})
+
+    def on_after_call_error(self, exception, context, **kwargs):
+        # botocore passes no model with this event, only the exception and context
+        if 'trace_start_ns' in context:
+            self._record(context, STATUS_ERROR, {})
+
+    def _record(self, context: Dict[str, Any], status: int, parsed: Dict[str, Any]):
+        end_ns = time.perf_counter_ns()
+        op = context.pop('trace_op')
+        start_ns = context.pop('trace_start_ns')
+        params = context.pop('trace_params')
+        table = params.get('TableName', '')
+        index = params.get('IndexName')
+
+        if op in ('GetItem', 'DeleteItem'):
+            payload = {'Key': params['Key']}
+            size = item_size(parsed.get('Item') or parsed.get('Attributes'))
+        elif op == 'UpdateItem':
+            payload = {'Key': params['Key']}
+            size = item_size(params['Key']) + item_size(params.get('ExpressionAttributeValues'))
+        elif op == 'PutItem':
+            payload = {'Key': self.key_of(table, params['Item'])}
+            size = item_size(params['Item'])
+        elif op in ('Query', 'Scan'):
+            payload = {name: params[name] for name in READ_PARAMETERS if name in params}
+            size = sum(item_size(item) for item in parsed.get('Items', []))
+        elif op == 'BatchWriteItem':
+            # One record per table, all sharing the call's timing
+            for table_name, requests in params['RequestItems'].items():
+                puts = [request['PutRequest']['Item'] for request in requests if 'PutRequest' in request]
+                payload = {
+                    'Puts': [self.key_of(table_name, item) for item in puts],
+                    'Deletes': [request['DeleteRequest']['Key'] for request in requests if 'DeleteRequest' in request],
+                }
+                self.writer.write(op, table_name, None, start_ns, end_ns, status,
+                                  sum(item_size(item) for item in puts), payload)
+            return
+        elif op == 'BatchGetItem':
+            responses = parsed.get('Responses', {})
+            for table_name, request in params['RequestItems'].items():
+                self.writer.write(op, table_name, None, start_ns, end_ns, status,
+                                  sum(item_size(item) for item in responses.get(table_name, [])),
+                                  {'Keys': request['Keys']})
+            return
+        else:
+            payload = {}
+            size = 0
+
+        self.writer.write(op, table, index, start_ns, end_ns, status, size, payload)
+
+
+def attach_recorder(dynamodb, path: str) -> TraceWriter:
+    """Record every call made through `dynamodb` into the trace at `path`."""
+    writer = TraceWriter(path)
+    recorder = TraceRecorder(writer, dynamodb)
+    events = dynamodb.meta.events
+    events.register('provide-client-params.dynamodb', recorder.on_params)
+    events.register('after-call.dynamodb', recorder.on_after_call)
+    events.register('after-call-error.dynamodb', recorder.on_after_call_error)
+    atexit.register(writer.close)
+    return writer
+
+
+class TraceReader:
+    """Stream the records of a trace file through mmap."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as handle:
+            magic, self.started_epoch_ns = HEADER.unpack(handle.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a DynamoDB trace file")
+
+    def __iter__(self) -> Iterator[TraceRecord]:
+        strings: Dict[int, str] = {}
+        with open(self.path, 'rb') as handle:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                offset = HEADER.size
+                end = len(data)
+                while offset < end:
+                    kind = data[offset]
+                    if kind == KIND_STRING:
+                        _, string_id, length = STRING_RECORD.unpack_from(data, offset)
+                        offset += STRING_RECORD.size
+                        strings[string_id] = data[offset:offset + length].decode('utf-8')
+                        offset += length
+                    elif kind == KIND_OP:
+                        (_, op, status, table_id, index_id, start_ns, duration_us,
+                         size, payload_length) = OP_RECORD.unpack_from(data, offset)
+                        offset += OP_RECORD.size
+                        payload = data[offset:offset + payload_length]
+                        offset += payload_length
+                        yield TraceRecord(
+                            OPERATIONS[op], strings[table_id],
+                            strings[index_id] if index_id != NO_INDEX else None,
+                            start_ns, start_ns + duration_us * 1000, status, size, payload
+                        )
+                    else:
+                        raise ValueError(f"Corrupt trace record at byte {offset}")
+
+
+def in_start_order(records: Iterable[TraceRecord], window_ns: int = REORDER_WINDOW_NS) -> Iterator[TraceRecord]:
+    """Re-sort records from completion order into start order.
+
+    A record is held back until no call completing later could have started
+    before it, assuming no call runs longer than `window_ns`. Only records
+    that completed within the last `window_ns` are buffered.
+    """
+    pending = []
+    for sequence, record in enumerate(records):
+        heapq.heappush(pending, (record.start_ns, sequence, record))
+        horizon = record.end_ns - window_ns
+        while pending and pending[0][0] <= horizon:
+            yield heapq.heappop(pending)[2]
+    while pending:
+        yield heapq.heappop(pending)[2]
+
+
+def summarize(path: str):
+    """Print operation counts and recorded latencies of a trace."""
+    counts = Counter()
+    durations: Dict[tuple, int] = Counter()
+    statuses = Counter()
+    last_ns = 0
+    for record in TraceReader(path):
+        key = (record.op, record.table, record.index or '')
+        counts[key] += 1
+        durations[key] += record.end_ns - record.start_ns
+        statuses[record.status] += 1
+        last_ns = max(last_ns, record.end_ns)
+
+    total = sum(counts.values())
+    print(f"Trace {path}: {total} operations over {last_ns / 1e9:.2f}s")
+    print("-" * 80)
+    print(f"{'Operation':<16} {'Table':<18} {'Index':<26} {'Count':>9} {'avg ms':>8}")
+    for (op, table, index), count in counts.most_common():
+        print(f"{op:<16} {table:<18} {index:<26} {count:>9} {durations[(op, table, index)] / count / 1e6:>8.2f}")
+    print(f"\nThrottled: {statuses[STATUS_THROTTLED]}  Errors: {statuses[STATUS_ERROR]}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print("Usage: python dynamo_trace.py TRACE_FILE")
+        sys.exit(1)
+    summarize(sys.argv[1])
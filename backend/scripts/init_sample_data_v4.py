@@ -1,6 +1,7 @@
-import boto3
 from datetime import datetime, timedelta
 
+from dynamo_client import get_dynamodb_client
+
 def format_iso_date(date):
     """Format datetime for DynamoDB."""
     return date.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
@@ -8,7 +9,7 @@ def format_iso_date(date):
 def init_sample_data():
     """Initialize sample data for the Review System."""
     
-    dynamodb = boto3.client('dynamodb', region_name='ap-southeast-1')
+    dynamodb = get_dynamodb_client()
     
     # Current time
     current_time = datetime.utcnow()
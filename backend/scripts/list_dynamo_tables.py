@@ -1,9 +1,9 @@
-import boto3
+from dynamo_client import get_dynamodb_client
 import json
 
 def list_tables():
     # Initialize a DynamoDB client
-    dynamodb = boto3.client('dynamodb')
+    dynamodb = get_dynamodb_client()
     
     # List all tables
     try:
@@ -0,0 +1,123 @@
+import argparse
+import os
+import sys
+
+# Only the standard library is imported up front. Each command imports its
+# script when it runs, so commands that never reach AWS don't pay for boto3
+# or faker at startup.
+
+PROG = 'mlnote-tools'
+
+# Commands backed by a script with its own argument parser; the remaining
+# arguments are handed to that script's main() unchanged
+DELEGATED_COMMANDS = {
+    'cold': ('archive_cold_notes', 'Move old archived notes to cold files and back (tier, restore)'),
+    'plan': ('plan_capacity', 'Estimate item sizes, capacity and cost for the app tables'),
+    'replay': ('replay_trace', 'Replay a DynamoDB trace open-loop against DynamoDB Local'),
+    'bench': ('run_benchmarks', 'Run the script benchmarks or compare recorded runs (run, compare)'),
+}
+
+
+def seed(args):
+    if args.target == 'data':
+        from add_sample_data import add_sample_data, log_message
+        log_message("Starting sample data generation...")
+        add_sample_data()
+    elif args.target == 'atoms':
+        from add_sample_atoms import add_sample_atoms
+        add_sample_atoms()
+    elif args.target == 'review':
+        from init_sample_data_v4 import init_sample_data
+        init_sample_data()
+    else:
+        from init_responses import init_responses
+        init_responses()
+
+
+def verify(args):
+    from verify_notes import verify_notes
+    print("Verifying Notes in DynamoDB")
+    print("=" * 80)
+    verify_notes(args.table)
+
+
+def inspect(args):
+    if args.target == 'tables':
+        from list_dynamo_tables import list_tables
+        print("DynamoDB Table Information")
+        print("=" * 80)
+        list_tables()
+    else:
+        from check_notes_table import check_notes_table
+        print("Checking Notes Table Structure and Sample Data")
+        print("=" * 80)
+        check_notes_table()
+
+
+def trace(args):
+    from dynamo_trace import summarize
+    summarize(args.path)
+
+
+def delegate(command, extra_args):
+    """Run a script's own main() as if it had been called with `extra_args`."""
+    module_name = DELEGATED_COMMANDS[command][0]
+    module = __import__(module_name)
+    sys.argv = [f'{PROG} {command}'] + extra_args
+    return module.main()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog=PROG, description='Tools for the app\'s DynamoDB tables.')
+    parser.add_argument('--region', help='AWS region (default: AWS_DEFAULT_REGION or the AWS profile\'s region)')
+    parser.add_argument('--endpoint-url', help='DynamoDB endpoint, e.g. http://localhost:8000 for DynamoDB Local')
+    parser.add_argument('--trace-file', help='Record every DynamoDB call to this trace file')
+    subparsers = parser.add_subparsers(dest='command', required=True, metavar='COMMAND')
+
+    seed_parser = subparsers.add_parser('seed', help='Load sample data')
+    seed_parser.add_argument('target', choices=['data', 'atoms', 'review', 'responses'],
+                             help='data: users, notes and atoms; atoms: atoms only; '
+                                  'review: a review session; responses: a review response')
+    seed_parser.set_defaults(handler=seed)
+
+    verify_parser = subparsers.add_parser('verify', help='Check that sample notes were written')
+    verify_parser.add_argument('--table', default='Notes')
+    verify_parser.set_defaults(handler=verify)
+
+    inspect_parser = subparsers.add_parser('inspect', help='Describe tables')
+    inspect_parser.add_argument('target', choices=['tables', 'notes'],
+                                help='tables: every table in the region; notes: the Notes table with sample items')
+    inspect_parser.set_defaults(handler=inspect)
+
+    trace_parser = subparsers.add_parser('trace', help='Summarize a recorded DynamoDB trace')
+    # Not trace_file: that dest belongs to the global --trace-file, which records to its file
+    trace_parser.add_argument('path', metavar='TRACE_FILE')
+    trace_parser.set_defaults(handler=trace)
+
+    for command, (_, help_text) in DELEGATED_COMMANDS.items():
+        # No help of its own, so `-h` reaches the script's parser
+        subparsers.add_parser(command, help=help_text, add_help=False)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra_args = parser.parse_known_args(argv)
+
+    # Shared configuration, read by get_dynamodb_client() in every script
+    if args.region:
+        os.environ['AWS_DEFAULT_REGION'] = args.region
+    if args.endpoint_url:
+        os.environ['DYNAMODB_ENDPOINT_URL'] = args.endpoint_url
+    if args.trace_file:
+        os.environ['DYNAMODB_TRACE_FILE'] = args.trace_file
+
+    if args.command in DELEGATED_COMMANDS:
+        return delegate(args.command, extra_args)
+    if extra_args:
+        parser.error(f"unrecognized arguments: {' '.join(extra_args)}")
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
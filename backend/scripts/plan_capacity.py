@@ -0,0 +1,561 @@
+import argparse
+import json
+import math
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from dynamo_sizes import item_attribute_sizes
+
+# Key schemas as used by the repositories and services. Index projections
+# default to ALL; a live run replaces them with what describe_table reports.
+TABLES = {
+    'Notes': {
+        'keys': ['NoteId', 'UserId'],
+        'user_attribute': 'UserId',
+        'indexes': {
+            'userId-createdAt-index': {'keys': ['UserId', 'CreatedAt'], 'projection': 'ALL'}
+        }
+    },
+    'Atoms': {
+        'keys': ['atom_id'],
+        'user_attribute': 'user_id',
+        'indexes': {
+            'UserReviewDateIndex': {'keys': ['user_id', 'next_review_date'], 'projection': 'ALL'}
+        }
+    },
+    'ReviewSessions': {
+        'keys': ['session_id'],
+        'user_attribute': 'user_id',
+        'indexes': {}
+    },
+    'ReviewResponses': {
+        'keys': ['response_id'],
+        'user_attribute': None,
+        'indexes': {
+            'SessionResponsesIndex': {'keys': ['session_id'], 'projection': 'ALL'}
+        }
+    },
+    'User': {
+        'keys': ['UserId'],
+        'user_attribute': 'UserId',
+        'indexes': {}
+    }
+}
+
+# Access patterns of the repositories and services, per active user per day.
+# `items` says how many items one call reads or writes:
+#   one      - a single item (GetItem/PutItem/UpdateItem/DeleteItem)
+#   per_user - every item the user owns in the table or index
+#   due      - the due fraction of the user's atoms
+#   session  - the responses of one review session
+# `user_keyed` marks calls whose partition key is the user, so skew lands on one partition.
+ACCESS_PATTERNS = [
+    # NoteRepository: GetNotes, Search, Paginated, Count and GetAllTags all go through GetByUserIdAsync
+    {'name': 'NoteRepository.GetByUserIdAsync', 'table': 'Notes', 'index': 'userId-createdAt-index',
+     'op': 'query', 'items': 'per_user', 'per_user_day': 'note_list_calls', 'user_keyed': True},
+    {'name': 'NoteRepository.GetByTagAsync', 'table': 'Notes', 'index': 'userId-createdAt-index',
+     'op': 'query', 'items': 'per_user', 'per_user_day': 'note_tag_calls', 'user_keyed': True},
+    {'name': 'NoteRepository.GetByIdAsync', 'table': 'Notes', 'index': None,
+     'op': 'get', 'items': 'one', 'per_user_day': 'note_reads', 'user_keyed': False},
+    {'name': 'NoteRepository.CreateAsync', 'table': 'Notes', 'index': None,
+     'op': 'put', 'items': 'one', 'per_user_day': 'notes_created', 'user_keyed': False},
+    {'name': 'NoteRepository.UpdateAsync', 'table': 'Notes', 'index': None,
+     'op': 'update', 'items': 'one', 'per_user_day': 'notes_updated', 'user_keyed': False},
+    {'name': 'NoteRepository.ArchiveAsync', 'table': 'Notes', 'index': None,
+     'op': 'update', 'items': 'one', 'per_user_day': 'notes_archived', 'user_keyed': False},
+    {'name': 'NoteRepository.DeleteAsync', 'table': 'Notes', 'index': None,
+     'op': 'delete', 'items': 'one', 'per_user_day': 'notes_deleted', 'user_keyed': False},
+    # AtomRepository and ReviewService
+    {'name': 'AtomRepository.GetByUserIdAsync', 'table': 'Atoms', 'index': None,
+     'op': 'query', 'items': 'per_user', 'per_user_day': 'atom_list_calls', 'user_keyed': True},
+    {'name': 'AtomRepository.CreateAsync', 'table': 'Atoms', 'index': None,
+     'op': 'put', 'items': 'one', 'per_user_day': 'atoms_created', 'user_keyed': False},
+    {'name': 'ReviewService.GetDueAtomsAsync', 'table': 'Atoms', 'index': 'UserReviewDateIndex',
+     'op': 'query', 'items': 'due', 'per_user_day': 'sessions', 'user_keyed': True},
+    # ReviewSessionService
+    {'name': 'ReviewSessionService.StartSessionAsync', 'table': 'ReviewSessions', 'index': None,
+     'op': 'put', 'items': 'one', 'per_user_day': 'sessions', 'user_keyed': False},
+    {'name': 'ReviewSessionService.GetSessionByIdAsync', 'table': 'ReviewSessions', 'index': None,
+     'op': 'get', 'items': 'one', 'per_user_day': 'reviews', 'user_keyed': False},
+    {'name': 'ReviewSessionService.UpdateSessionProgressAsync', 'table': 'ReviewSessions', 'index': None,
+     'op': 'update', 'items': 'one', 'per_user_day': 'reviews', 'user_keyed': False},
+    {'name': 'ReviewSessionService.UpdateSessionStatusAsync', 'table': 'ReviewSessions', 'index': None,
+     'op': 'update', 'items': 'one', 'per_user_day': 'sessions', 'user_keyed': False},
+    {'name': 'ReviewSessionService.GetAtom', 'table': 'Atoms', 'index': None,
+     'op': 'get', 'items': 'one', 'per_user_day': 'reviews', 'user_keyed': False},
+    {'name': 'ReviewSessionService.UpdateAtomSchedulingAsync', 'table': 'Atoms', 'index': None,
+     'op': 'update', 'items': 'one', 'per_user_day': 'reviews', 'user_keyed': False},
+    {'name': 'ReviewSessionService.SaveResponse', 'table': 'ReviewResponses', 'index': None,
+     'op': 'put', 'items': 'one', 'per_user_day': 'reviews', 'user_keyed': False},
+    {'name': 'ReviewSessionService.CalculateSessionStatisticsAsync', 'table': 'ReviewResponses',
+     'index': 'SessionResponsesIndex', 'op': 'query', 'items': 'session', 'per_user_day': 'sessions',
+     'user_keyed': False},
+    # UserRepository
+    {'name': 'UserRepository.GetByIdAsync', 'table': 'User', 'index': None,
+     'op': 'get', 'items': 'one', 'per_user_day': 'profile_reads', 'user_keyed': True},
+]
+
+# Per active user per day, plus data shape assumptions when a sample can't tell us
+DEFAULT_WORKLOAD = {
+    'note_list_calls': 20,
+    'note_tag_calls': 2,
+    'note_reads': 10,
+    'notes_created': 2,
+    'notes_updated': 3,
+    'notes_archived': 0.5,
+    'notes_deleted': 0.2,
+    'atom_list_calls': 2,
+    'atoms_created': 6,
+    'sessions': 2,
+    'reviews': 40,
+    'profile_reads': 5,
+    'notes_per_user': 200,
+    'atoms_per_user': 800,
+    'due_fraction': 0.05,
+}
+
+# Default prices in USD (on-demand and provisioned standard table class); override per region
+DEFAULT_PRICES = {
+    'read_request_unit_million': 0.125,
+    'write_request_unit_million': 0.625,
+    'rcu_hour': 0.00013,
+    'wcu_hour': 0.00065,
+    'storage_gb_month': 0.25,
+}
+
+PARTITION_RCU_LIMIT = 3000
+PARTITION_WCU_LIMIT = 1000
+INDEX_ITEM_OVERHEAD = 100  # Bytes DynamoDB adds to every index entry
+SECONDS_PER_DAY = 86400
+
+
+def log_message(message):
+    """Helper function to log messages with timestamps."""
+    timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+    print(f"[{timestamp}] {message}")
+
+
+def index_entry_size(attribute_sizes: Dict[str, int], table: Dict[str, Any], index: Dict[str, Any]) -> Optional[int]:
+    """Size of the entry an item produces in an index, or None if the index is sparse for it."""
+    if any(key not in attribute_sizes for key in index['keys']):
+        return None
+    projection = index['projection']
+    if projection == 'ALL':
+        projected = attribute_sizes.keys()
+    else:
+        projected = set(table['keys']) | set(index['keys'])
+        if projection != 'KEYS_ONLY':
+            projected |= set(index.get('non_key_attributes', []))
+    return INDEX_ITEM_OVERHEAD + sum(attribute_sizes[name] for name in projected if name in attribute_sizes)
+
+
+class TableStats:
+    """Running item and index size statistics for one table."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.total_bytes = 0
+        self.max_bytes = 0
+        self.attribute_bytes: Dict[str, int] = defaultdict(int)
+        self.attribute_counts: Dict[str, int] = defaultdict(int)
+        self.index_items: Dict[str, int] = defaultdict(int)
+        self.index_bytes: Dict[str, int] = defaultdict(int)
+        self.users = set()
+        self.sessions = set()
+        self.table_item_count: Optional[int] = None  # ItemCount from describe_table in --scan mode
+
+    def add(self, item: Dict[str, Dict[str, Any]]):
+        table = TABLES.get(self.name, {'keys': [], 'user_attribute': None, 'indexes': {}})
+        sizes = item_attribute_sizes(item)
+        size = sum(sizes.values())
+        self.items += 1
+        self.total_bytes += size
+        if size > self.max_bytes:
+            self.max_bytes = size
+        for name, attribute_size in sizes.items():
+            self.attribute_bytes[name] += attribute_size
+            self.attribute_counts[name] += 1
+        for index_name, index in table['indexes'].items():
+            entry_size = index_entry_size(sizes, table, index)
+            if entry_size is not None:
+                self.index_items[index_name] += 1
+                self.index_bytes[index_name] += entry_size
+
+        user_attribute = table['user_attribute']
+        if user_attribute and user_attribute in item:
+            self.users.add(next(iter(item[user_attribute].values())))
+        if 'session_id' in item and self.name == 'ReviewResponses':
+            self.sessions.add(item['session_id'].get('S'))
+
+    def merge(self, other: 'TableStats'):
+        self.items += other.items
+        self.total_bytes += other.total_bytes
+        self.max_bytes = max(self.max_bytes, other.max_bytes)
+        for name, value in other.attribute_bytes.items():
+            self.attribute_bytes[name] += value
+        for name, value in other.attribute_counts.items():
+            self.attribute_counts[name] += value
+        for name, value in other.index_items.items():
+            self.index_items[name] += value
+        for name, value in other.index_bytes.items():
+            self.index_bytes[name] += value
+        self.users |= other.users
+        self.sessions |= other.sessions
+
+    @property
+    def average_bytes(self) -> float:
+        return self.total_bytes / self.items if self.items else 0.0
+
+    def average_index_bytes(self, index_name: str) -> float:
+        count = self.index_items.get(index_name, 0)
+        return self.index_bytes[index_name] / count if count else 0.0
+
+    @property
+    def sample_scale(self) -> float:
+        """Table items per sampled item; 1 when the sample covers the whole table.
+
+        A capped sample still meets most users, just with fewer items each,
+        so per-user and per-session counts are scaled up by this factor.
+        """
+        if self.table_item_count and self.items and self.table_item_count > self.items:
+            return self.table_item_count / self.items
+        return 1.0
+
+
+def read_fixture(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (table, item) pairs from a fixture file.
+
+    Accepts JSON lines of {"table": ..., "item": {...}} or a JSON object
+    mapping table names to lists of items, both in DynamoDB JSON.
+    """
+    with open(path, 'r', encoding='utf-8') as handle:
+        if path.endswith('.jsonl'):
+            for line in handle:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record['table'], record['item']
+        else:
+            for table_name, items in json.load(handle).items():
+                for item in items:
+                    yield table_name, item
+
+
+def collect_fixture_stats(path: str) -> Dict[str, TableStats]:
+    """Size every item in a fixture file."""
+    stats: Dict[str, TableStats] = {}
+    for table_name, item in read_fixture(path):
+        table_stats = stats.get(table_name)
+        if table_stats is None:
+            table_stats = stats[table_name] = TableStats(table_name)
+        table_stats.add(item)
+    return stats
+
+
+def load_live_projections(dynamodb, table_name: str):
+    """Replace the assumed index projections with the table's real ones."""
+    table = dynamodb.describe_table(TableName=table_name)['Table']
+    known = TABLES.setdefault(table_name, {'keys': [], 'user_attribute': None, 'indexes': {}})
+    known['keys'] = [key['AttributeName'] for key in table.get('KeySchema', [])]
+    for gsi in table.get('GlobalSecondaryIndexes', []):
+        projection = gsi.get('Projection', {})
+        known['indexes'][gsi['IndexName']] = {
+            'keys': [key['AttributeName'] for key in gsi['KeySchema']],
+            'projection': projection.get('ProjectionType', 'ALL'),
+            'non_key_attributes': projection.get('NonKeyAttributes', []),
+        }
+    return table.get('ItemCount', 0)
+
+
+def scan_segment(dynamodb, table_name: str, segment: int, total_segments: int, limit: int) -> TableStats:
+    """Scan one parallel-scan segment, sizing up to `limit` items."""
+    stats = TableStats(table_name)
+    paginator = dynamodb.get_paginator('scan')
+    pages = paginator.paginate(
+        TableName=table_name,
+        Segment=segment,
+        TotalSegments=total_segments,
+        PaginationConfig={'PageSize': 1000}
+    )
+    for page in pages:
+        for item in page.get('Items', []):
+            stats.add(item)
+        if stats.items >= limit:
+            break
+    return stats
+
+
+def collect_scan_stats(dynamodb, table_names: Iterable[str], segments: int, sample: int) -> Dict[str, TableStats]:
+    """Sample each table with a parallel scan."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    stats: Dict[str, TableStats] = {}
+    per_segment = max(1, math.ceil(sample / segments))
+    with ThreadPoolExecutor(max_workers=segments) as executor:
+        for table_name in table_names:
+            item_count = load_live_projections(dynamodb, table_name)
+            futures = [
+                executor.submit(scan_segment, dynamodb, table_name, segment, segments, per_segment)
+                for segment in range(segments)
+            ]
+            table_stats = TableStats(table_name)
+            for future in futures:
+                table_stats.merge(future.result())
+            table_stats.table_item_count = item_count
+            stats[table_name] = table_stats
+    return stats
+
+
+def read_units(total_bytes: float, strongly_consistent: bool = False) -> float:
+    """RCU for reading `total_bytes` in one request."""
+    units = max(1, math.ceil(total_bytes / 4096))
+    return units if strongly_consistent else units / 2
+
+
+def write_units(item_bytes: float) -> float:
+    """WCU for writing one item of `item_bytes`."""
+    return max(1, math.ceil(item_bytes / 1024))
+
+
+def hottest_user_share(users: int, skew: float) -> float:
+    """Share of traffic from the busiest user when activity follows a Zipf(skew) law."""
+    if skew <= 0:
+        return 1.0 / users
+    # Harmonic number H(n, s), summed exactly for small n and approximated beyond
+    exact = min(users, 10000)
+    harmonic = sum(1.0 / (rank ** skew) for rank in range(1, exact + 1))
+    if users > exact:
+        if skew == 1:
+            harmonic += math.log(users / exact)
+        else:
+            harmonic += (users ** (1 - skew) - exact ** (1 - skew)) / (1 - skew)
+    return 1.0 / harmonic
+
+
+def items_per_call(pattern: Dict[str, Any], stats: Dict[str, TableStats], workload: Dict[str, float]) -> float:
+    """How many items one call of an access pattern touches."""
+    kind = pattern['items']
+    if kind == 'one':
+        return 1
+    if kind == 'session':
+        responses = stats.get('ReviewResponses')
+        if responses and responses.sessions:
+            return responses.items * responses.sample_scale / len(responses.sessions)
+        return workload['reviews'] / max(workload['sessions'], 1)
+
+    table_stats = stats.get(pattern['table'])
+    if table_stats and table_stats.users:
+        per_user = table_stats.items * table_stats.sample_scale / len(table_stats.users)
+    else:
+        per_user = workload['notes_per_user' if pattern['table'] == 'Notes' else 'atoms_per_user']
+    return per_user * workload['due_fraction'] if kind == 'due' else per_user
+
+
+def entry_bytes(pattern: Dict[str, Any], stats: Dict[str, TableStats], fallback: float) -> float:
+    """Average size of the item or index entry an access pattern reads."""
+    table_stats = stats.get(pattern['table'])
+    if not table_stats or not table_stats.items:
+        return fallback
+    if pattern['index']:
+        return table_stats.average_index_bytes(pattern['index']) or fallback
+    return table_stats.average_bytes
+
+
+def index_write_units(table_name: str, stats: Dict[str, TableStats], fallback: float) -> float:
+    """Extra WCU each base-table write spends keeping the table's indexes current."""
+    table_stats = stats.get(table_name)
+    total = 0.0
+    for index_name in TABLES.get(table_name, {}).get('indexes', {}):
+        if table_stats and table_stats.items:
+            # Sparse indexes only receive the share of items carrying their keys
+            coverage = table_stats.index_items.get(index_name, 0) / table_stats.items
+            size = table_stats.average_index_bytes(index_name) or fallback
+        else:
+            coverage, size = 1.0, fallback
+        total += coverage * write_units(size)
+    return total
+
+
+def forecast(stats: Dict[str, TableStats], users: int, skew: float, peak_factor: float,
+             workload: Dict[str, float], prices: Dict[str, float], default_item_bytes: float) -> Dict[str, Any]:
+    """Model per-pattern and per-table capacity for `users` active users."""
+    hot_share = hottest_user_share(users, skew)
+    patterns = []
+    tables: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+    for pattern in ACCESS_PATTERNS:
+        calls_per_second = users * workload[pattern['per_user_day']] / SECONDS_PER_DAY
+        items = items_per_call(pattern, stats, workload)
+        size = entry_bytes(pattern, stats, default_item_bytes)
+        if pattern['op'] in ('get', 'query'):
+            rcu = read_units(items * size) if pattern['op'] == 'query' else read_units(size)
+            wcu = 0.0
+        else:
+            rcu = 0.0
+            wcu = write_units(size) + index_write_units(pattern['table'], stats, default_item_bytes)
+
+        average_rcu = calls_per_second * rcu
+        average_wcu = calls_per_second * wcu
+        # Calls keyed by user all land on the busiest user's partition
+        hot_rcu = average_rcu * peak_factor * hot_share if pattern['user_keyed'] else 0.0
+        hot_wcu = average_wcu * peak_factor * hot_share if pattern['user_keyed'] else 0.0
+        patterns.append({
+            'name': pattern['name'], 'table': pattern['table'], 'index': pattern['index'],
+            'calls_per_second': calls_per_second, 'items_per_call': items,
+            'rcu_per_call': rcu, 'wcu_per_call': wcu,
+            'average_rcu': average_rcu, 'average_wcu': average_wcu,
+            'hot_partition_rcu': hot_rcu,
+            'hot_partition_wcu': hot_wcu,
+        })
+
+        table = tables[pattern['table']]
+        table['average_rcu'] += average_rcu
+        table['average_wcu'] += average_wcu
+        table['hot_partition_rcu'] += hot_rcu
+        table['hot_partition_wcu'] += hot_wcu
+
+    for table_name, table in tables.items():
+        table['peak_rcu'] = table['average_rcu'] * peak_factor
+        table['peak_wcu'] = table['average_wcu'] * peak_factor
+        table['storage_gb'] = storage_bytes(table_name, stats, users, workload, default_item_bytes) / 1024 ** 3
+
+        month_seconds = SECONDS_PER_DAY * 30
+        table['on_demand_month'] = (
+            table['average_rcu'] * month_seconds * prices['read_request_unit_million'] / 1e6
+            + table['average_wcu'] * month_seconds * prices['write_request_unit_million'] / 1e6
+        )
+        table['provisioned_month'] = (
+            math.ceil(table['peak_rcu']) * 24 * 30 * prices['rcu_hour']
+            + math.ceil(table['peak_wcu']) * 24 * 30 * prices['wcu_hour']
+        )
+        table['storage_month'] = table['storage_gb'] * prices['storage_gb_month']
+
+    return {'users': users, 'skew': skew, 'hot_share': hot_share, 'patterns': patterns, 'tables': dict(tables)}
+
+
+def storage_bytes(table_name: str, stats: Dict[str, TableStats], users: int,
+                  workload: Dict[str, float], default_item_bytes: float) -> float:
+    """Projected table plus index storage at `users` users."""
+    table_stats = stats.get(table_name)
+    if table_stats and table_stats.items and table_stats.users:
+        sampled_bytes = table_stats.total_bytes + sum(table_stats.index_bytes.values())
+        per_user = sampled_bytes * table_stats.sample_scale / len(table_stats.users)
+        return per_user * users
+    items_per_user = {
+        'Notes': workload['notes_per_user'],
+        'Atoms': workload['atoms_per_user'],
+        'User': 1,
+        # Items live until their TTL: 7 days for sessions, 90 days for responses
+        'ReviewSessions': workload['sessions'] * 7,
+        'ReviewResponses': workload['reviews'] * 90,
+    }.get(table_name, 0)
+    index_count = len(TABLES.get(table_name, {}).get('indexes', {}))
+    return items_per_user * users * (default_item_bytes * (1 + index_count) + INDEX_ITEM_OVERHEAD * index_count)
+
+
+def print_sizes(stats: Dict[str, TableStats]):
+    """Print item and index entry sizes per table and attribute."""
+    for table_name, table_stats in sorted(stats.items()):
+        print(f"\nTable: {table_name}")
+        print("-" * 80)
+        if table_stats.sample_scale > 1:
+            print(f"Sampled items: {table_stats.items} of about {table_stats.table_item_count} "
+                  f"(per-user counts scaled by {table_stats.sample_scale:.1f}x)")
+        else:
+            print(f"Sampled items: {table_stats.items}")
+        print(f"Average item size: {table_stats.average_bytes:.1f} bytes (max {table_stats.max_bytes})")
+        print("\nAttribute sizes (average bytes, present in % of items):")
+        for name, total in sorted(table_stats.attribute_bytes.items(), key=lambda entry: -entry[1]):
+            count = table_stats.attribute_counts[name]
+            print(f"  {name:<28} {total / count:>10.1f}  {100.0 * count / table_stats.items:>6.1f}%")
+        for index_name in TABLES.get(table_name, {}).get('indexes', {}):
+            count = table_stats.index_items.get(index_name, 0)
+            print(f"\nIndex {index_name}: {count} entries, "
+                  f"average {table_stats.average_index_bytes(index_name):.1f} bytes incl. projection overhead")
+
+
+def print_forecast(result: Dict[str, Any]):
+    """Print the per-pattern and per-table capacity and cost forecast."""
+    print(f"\nCapacity forecast for {result['users']} active users (skew {result['skew']}, "
+          f"busiest user {100 * result['hot_share']:.2f}% of traffic)")
+    print("=" * 80)
+    print(f"{'Access pattern':<52} {'calls/s':>9} {'RCU/s':>9} {'WCU/s':>9}")
+    for pattern in result['patterns']:
+        print(f"{pattern['name']:<52} {pattern['calls_per_second']:>9.2f} "
+              f"{pattern['average_rcu']:>9.2f} {pattern['average_wcu']:>9.2f}")
+
+    print(f"\n{'Table':<16} {'avg RCU':>9} {'avg WCU':>9} {'peak RCU':>9} {'peak WCU':>9} "
+          f"{'GB':>8} {'on-demand':>10} {'provisioned':>12} {'storage':>9}")
+    for table_name, table in sorted(result['tables'].items()):
+        print(f"{table_name:<16} {table['average_rcu']:>9.2f} {table['average_wcu']:>9.2f} "
+              f"{table['peak_rcu']:>9.2f} {table['peak_wcu']:>9.2f} {table['storage_gb']:>8.2f} "
+              f"{table['on_demand_month']:>10.2f} {table['provisioned_month']:>12.2f} {table['storage_month']:>9.2f}")
+
+    print("\nHot partition check (busiest user at peak):")
+    for table_name, table in sorted(result['tables'].items()):
+        warnings = []
+        if table['hot_partition_rcu'] > PARTITION_RCU_LIMIT:
+            warnings.append(f"RCU {table['hot_partition_rcu']:.0f} > {PARTITION_RCU_LIMIT}")
+        if table['hot_partition_wcu'] > PARTITION_WCU_LIMIT:
+            warnings.append(f"WCU {table['hot_partition_wcu']:.0f} > {PARTITION_WCU_LIMIT}")
+        status = 'THROTTLE RISK: ' + ', '.join(warnings) if warnings else 'ok'
+        print(f"  {table_name:<16} RCU {table['hot_partition_rcu']:>8.2f}  WCU {table['hot_partition_wcu']:>8.2f}  {status}")
+    print("\nMonthly costs are in USD; override prices with --price for your region.")
+
+
+def parse_overrides(values: List[str], defaults: Dict[str, float], label: str) -> Dict[str, float]:
+    """Apply NAME=VALUE overrides on top of a defaults dict."""
+    result = dict(defaults)
+    for value in values or []:
+        name, _, number = value.partition('=')
+        if name not in result:
+            raise SystemExit(f"Unknown {label} '{name}'; expected one of: {', '.join(sorted(result))}")
+        result[name] = float(number)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Estimate DynamoDB item sizes, capacity and cost for the app tables.')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--fixture', help='JSON or JSON lines file of sample items in DynamoDB JSON')
+    source.add_argument('--scan', nargs='*', metavar='TABLE',
+                        help='Sample live tables with a parallel scan (defaults to all known tables)')
+    parser.add_argument('--segments', type=int, default=8, help='Parallel scan segments')
+    parser.add_argument('--sample', type=int, default=100000, help='Items to sample per table when scanning')
+    parser.add_argument('--users', type=int, default=10000, help='Active users to plan for')
+    parser.add_argument('--skew', type=float, default=1.0, help='Zipf exponent of per-user activity (0 = uniform)')
+    parser.add_argument('--peak-factor', type=float, default=3.0, help='Peak to average traffic ratio')
+    parser.add_argument('--item-bytes', type=float, default=1024, help='Item size to assume for unsampled tables')
+    parser.add_argument('--workload', action='append', metavar='NAME=VALUE', help='Override a workload assumption')
+    parser.add_argument('--price', action='append', metavar='NAME=VALUE', help='Override a unit price')
+    parser.add_argument('--json', action='store_true', help='Print the forecast as JSON')
+    args = parser.parse_args()
+
+    workload = parse_overrides(args.workload, DEFAULT_WORKLOAD, 'workload setting')
+    prices = parse_overrides(args.price, DEFAULT_PRICES, 'price')
+
+    started = time.perf_counter()
+    if args.fixture:
+        stats = collect_fixture_stats(args.fixture)
+    else:
+        from dynamo_client import get_dynamodb_client
+
+        dynamodb = get_dynamodb_client()
+        stats = collect_scan_stats(dynamodb, args.scan or list(TABLES), args.segments, args.sample)
+    elapsed = time.perf_counter() - started
+    sampled = sum(table_stats.items for table_stats in stats.values())
+    log_message(f"Sized {sampled} items in {elapsed:.2f}s ({sampled / max(elapsed, 1e-9) * 60:,.0f} items/minute)")
+
+    result = forecast(stats, args.users, args.skew, args.peak_factor, workload, prices, args.item_bytes)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print_sizes(stats)
+    print_forecast(result)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Tuple
+
+from dynamo_trace import TraceReader, TraceRecord, THROTTLE_CODES, STATUS_THROTTLED, in_start_order, item_size
+
+PADDING_ATTRIBUTE = 'TracePadding'  # Filler attribute that brings replayed writes up to the recorded size
+
+OP_METHODS = {
+    'GetItem': 'get_item',
+    'PutItem': 'put_item',
+    'UpdateItem': 'update_item',
+    'DeleteItem': 'delete_item',
+    'Query': 'query',
+    'Scan': 'scan',
+    'BatchGetItem': 'batch_get_item',
+    'BatchWriteItem': 'batch_write_item',
+    'DescribeTable': 'describe_table',
+    'ListTables': 'list_tables',
+}
+
+
+def log_message(message):
+    """Helper function to log messages with timestamps."""
+    timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+    print(f"[{timestamp}] {message}")
+
+
+def padded_item(key: Dict[str, Any], size: int) -> Dict[str, Any]:
+    """An item with the given key, padded to roughly `size` bytes."""
+    item = dict(key)
+    filler = size - item_size(key) - len(PADDING_ATTRIBUTE)
+    if filler > 0:
+        item[PADDING_ATTRIBUTE] = {'S': 'x' * filler}
+    return item
+
+
+def build_request(record: TraceRecord) -> Tuple[str, Dict[str, Any]]:
+    """Turn a trace record back into a client method and its arguments."""
+    payload = json.loads(record.payload) if record.payload else {}
+    kwargs: Dict[str, Any] = {}
+    if record.op not in ('ListTables', 'BatchGetItem', 'BatchWriteItem'):
+        kwargs['TableName'] = record.table
+    if record.index:
+        kwargs['IndexName'] = record.index
+
+    if record.op in ('GetItem', 'DeleteItem'):
+        kwargs['Key'] = payload['Key']
+    elif record.op == 'PutItem':
+        kwargs['Item'] = padded_item(payload['Key'], record.item_size)
+    elif record.op == 'UpdateItem':
+        filler = max(1, record.item_size - item_size(payload['Key']))
+        kwargs['Key'] = payload['Key']
+        kwargs['UpdateExpression'] = f'SET {PADDING_ATTRIBUTE} = :padding'
+        kwargs['ExpressionAttributeValues'] = {':padding': {'S': 'x' * filler}}
+    elif record.op in ('Query', 'Scan'):
+        kwargs.update(payload)
+    elif record.op == 'BatchWriteItem':
+        puts = payload.get('Puts', [])
+        per_item = record.item_size // len(puts) if puts else 0
+        requests = [{'PutRequest': {'Item': padded_item(key, per_item)}} for key in puts]
+        requests += [{'DeleteRequest': {'Key': key}} for key in payload.get('Deletes', [])]
+        kwargs['RequestItems'] = {record.table: requests}
+    elif record.op == 'BatchGetItem':
+        kwargs['RequestItems'] = {record.table: {'Keys': payload['Keys']}}
+    return OP_METHODS[record.op], kwargs
+
+
+def issue(dynamodb, method: str, kwargs: Dict[str, Any]) -> Tuple[float, float, str]:
+    """Make one call; returns its start, end and outcome (ok, throttled or error)."""
+    started = time.monotonic()
+    try:
+        getattr(dynamodb, method)(**kwargs)
+        outcome = 'ok'
+    except Exception as e:
+        code = getattr(e, 'response', {}).get('Error', {}).get('Code')
+        outcome = 'throttled' if code in THROTTLE_CODES else 'error'
+    return started, time.monotonic(), outcome
+
+
+class ReplayStats:
+    """Latency samples and outcome counts for one replay run."""
+
+    def __init__(self):
+        self.service_ms = array('d')  # Time spent inside the call
+        self.response_ms = array('d')  # From the scheduled start, so queueing counts
+        self.lag_ms = array('d')  # How late the dispatcher released each request
+        self.recorded_ms = array('d')
+        self.recorded_throttled = 0
+        self.outcomes = {'ok': 0, 'throttled': 0, 'error': 0}
+
+    def add(self, scheduled: float, dispatched: float, started: float, ended: float,
+            outcome: str, record: TraceRecord):
+        self.service_ms.append((ended - started) * 1000)
+        self.response_ms.append((ended - scheduled) * 1000)
+        self.lag_ms.append((dispatched - scheduled) * 1000)
+        self.recorded_ms.append((record.end_ns - record.start_ns) / 1e6)
+        if record.status == STATUS_THROTTLED:
+            self.recorded_throttled += 1
+        self.outcomes[outcome] += 1
+
+
+def percentile(samples: array, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def replay(trace_path: str, dynamodb, speed: float, workers: int, limit: int) -> Dict[str, Any]:
+    """Reissue a trace open-loop: requests start on schedule whether or not earlier ones finished."""
+    loop = asyncio.get_running_loop()
+    stats = ReplayStats()
+    pending = set()
+    issued = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        origin = loop.time()
+        # Records are stored in completion order; schedule them by start time
+        for record in in_start_order(TraceReader(trace_path)):
+            if limit and issued >= limit:
+                break
+            scheduled = origin + record.start_ns / 1e9 / speed
+            delay = scheduled - loop.time()
+            if delay > 0.0005:
+                await asyncio.sleep(delay)
+
+            method, kwargs = build_request(record)
+            dispatched = loop.time()
+            future = loop.run_in_executor(executor, issue, dynamodb, method, kwargs)
+            future.add_done_callback(
+                lambda done, scheduled=scheduled, dispatched=dispatched, record=record:
+                stats.add(scheduled, dispatched, *done.result(), record)
+            )
+            pending.add(future)
+            future.add_done_callback(pending.discard)
+            issued += 1
+
+        if pending:
+            await asyncio.wait(pending)
+        elapsed = loop.time() - origin
+
+    return {
+        'speed': speed,
+        'operations': issued,
+        'elapsed_s': elapsed,
+        'throughput': issued / elapsed if elapsed else 0.0,
+        'service_p50_ms': percentile(stats.service_ms, 0.50),
+        'service_p99_ms': percentile(stats.service_ms, 0.99),
+        'response_p50_ms': percentile(stats.response_ms, 0.50),
+        'response_p99_ms': percentile(stats.response_ms, 0.99),
+        'lag_p99_ms': percentile(stats.lag_ms, 0.99),
+        'recorded_p50_ms': percentile(stats.recorded_ms, 0.50),
+        'recorded_p99_ms': percentile(stats.recorded_ms, 0.99),
+        'recorded_throttled': stats.recorded_throttled,
+        'throttled': stats.outcomes['throttled'],
+        'errors': stats.outcomes['error'],
+    }
+
+
+def print_results(results: List[Dict[str, Any]]):
+    """Print how latency and throttling change with replay speed."""
+    print("\nReplay results")
+    print("=" * 110)
+    print(f"{'speed':>6} {'ops':>9} {'ops/s':>9} {'svc p50':>8} {'svc p99':>8} {'resp p50':>9} "
+          f"{'resp p99':>9} {'lag p99':>8} {'rec p99':>8} {'throttled':>10} {'errors':>7}")
+    for result in results:
+        throttle_rate = 100.0 * result['throttled'] / result['operations'] if result['operations'] else 0.0
+        print(f"{result['speed']:>5g}x {result['operations']:>9} {result['throughput']:>9.1f} "
+              f"{result['service_p50_ms']:>8.2f} {result['service_p99_ms']:>8.2f} "
+              f"{result['response_p50_ms']:>9.2f} {result['response_p99_ms']:>9.2f} "
+              f"{result['lag_p99_ms']:>8.2f} {result['recorded_p99_ms']:>8.2f} "
+              f"{result['throttled']:>4} ({throttle_rate:4.1f}%) {result['errors']:>7}")
+    print("\nLatencies in ms. resp = from scheduled start, including queueing; rec = as recorded in the trace.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a DynamoDB trace open-loop against DynamoDB Local.')
+    parser.add_argument('trace', help='Trace file recorded with DYNAMODB_TRACE_FILE')
+    parser.add_argument('--speed', type=float, nargs='+', default=[1.0, 10.0, 100.0],
+                        help='Replay speeds to run, one after another')
+    parser.add_argument('--endpoint-url', default=os.getenv('DYNAMODB_ENDPOINT_URL', 'http://localhost:8000'))
+    parser.add_argument('--workers', type=int, default=256, help='Maximum concurrent requests')
+    parser.add_argument('--limit', type=int, default=0, help='Replay only the first N operations')
+    parser.add_argument('--max-attempts', type=int, default=1,
+                        help='Client attempts per call; 1 surfaces throttling instead of retrying it away')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    from botocore.config import Config
+    from dynamo_client import get_dynamodb_client
+
+    os.environ['DYNAMODB_ENDPOINT_URL'] = args.endpoint_url
+    config = Config(
+        retries={'max_attempts': args.max_attempts, 'mode': 'standard'},
+        max_pool_connections=args.workers
+    )
+    dynamodb = get_dynamodb_client(config=config, record_trace=False)
+
+    results = []
+    for speed in args.speed:
+        log_message(f"Replaying {args.trace} at {speed:g}x against {args.endpoint_url}...")
+        results.append(asyncio.run(replay(args.trace, dynamodb, speed, args.workers, args.limit)))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+
+
+if __name__ == '__main__':
+    main()
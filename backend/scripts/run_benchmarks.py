@@ -0,0 +1,469 @@
+import argparse
+import contextlib
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Callable, Optional
+
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_history.json')
+DEFAULT_SIZES = [1000, 100000, 1000000]
+BENCH_TABLE_PREFIX = 'bench-'
+BATCH_SIZE = 25  # BatchWriteItem limit
+STABLE_RUN_SECONDS = 5.0
+MIN_SAMPLE_SECONDS = 0.2  # Short benchmarks are called in a loop until a sample takes this long
+
+# Lower is worse for throughput; higher is worse for memory
+HIGHER_IS_BETTER = {'throughput': True, 'peak_rss_kb': False, 'alloc_peak_bytes': False}
+
+
+def log_message(message):
+    """Helper function to log messages with timestamps."""
+    timestamp = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+    print(f"[{timestamp}] {message}")
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the progress output the scripts print per item."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def read_status_kb(field: str) -> Optional[int]:
+    """A memory field of /proc/self/status in kB, or None off Linux."""
+    try:
+        with open('/proc/self/status', 'r') as handle:
+            for line in handle:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss():
+    """Restart the kernel's peak RSS count from the current RSS (Linux only)."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as handle:
+            handle.write('5')
+    except OSError:
+        pass
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Peak resident set size of this process in kB, or None where it can't be read."""
+    peak = read_status_kb('VmHWM')
+    if peak is not None:
+        return peak
+    try:
+        import resource  # Unix only
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak  # macOS reports bytes
+
+
+def make_notes(count: int, users: int) -> List[Dict[str, Any]]:
+    """Cheap notes with the attributes NoteRepository writes, for seeding tables."""
+    current_time = str(int(time.time()))
+    return [
+        {
+            'NoteId': {'S': f'note-user-{i % users:03d}-{i:07d}'},
+            'UserId': {'S': f'user-{i % users:03d}'},
+            'Title': {'S': f'Benchmark note {i}'},
+            'Content': {'S': 'Lorem ipsum dolor sit amet. ' * 20},
+            'Format': {'S': 'plain'},
+            'Tags': {'SS': ['benchmark', f'tag-{i % 7}']},
+            'CreatedAt': {'N': current_time},
+            'UpdatedAt': {'N': current_time},
+            'IsArchived': {'BOOL': False},
+            'SourceType': {'S': 'manual'},
+            'QualityScore': {'N': '0.75'},
+            'KnowledgeDensity': {'N': '0.5'},
+            'WordCount': {'N': '100'},
+            'AtomCount': {'N': '3'},
+        }
+        for i in range(count)
+    ]
+
+
+def create_bench_table(dynamodb, name: str, keys: List[str]):
+    """(Re)create an on-demand table with string keys; the first key is the hash key."""
+    try:
+        dynamodb.delete_table(TableName=name)
+        dynamodb.get_waiter('table_not_exists').wait(TableName=name)
+    except dynamodb.exceptions.ResourceNotFoundException:
+        pass
+    dynamodb.create_table(
+        TableName=name,
+        KeySchema=[
+            {'AttributeName': key, 'KeyType': 'HASH' if i == 0 else 'RANGE'} for i, key in enumerate(keys)
+        ],
+        AttributeDefinitions=[{'AttributeName': key, 'AttributeType': 'S'} for key in keys],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    dynamodb.get_waiter('table_exists').wait(TableName=name)
+
+
+def seed_table(dynamodb, name: str, items: List[Dict[str, Any]]):
+    """Load items with BatchWriteItem, outside the timed section."""
+    for start in range(0, len(items), BATCH_SIZE):
+        pending = {name: [{'PutRequest': {'Item': item}} for item in items[start:start + BATCH_SIZE]]}
+        while pending:
+            pending = dynamodb.batch_write_item(RequestItems=pending).get('UnprocessedItems') or {}
+
+
+# Each benchmark does its setup and returns the timed callable, which
+# returns the number of items it processed.
+
+def bench_format_iso_date(size: int, dynamodb) -> Callable[[], int]:
+    from add_sample_atoms import format_iso_date
+
+    base = datetime(2025, 1, 1)
+    dates = [base + timedelta(seconds=i) for i in range(size)]
+
+    def run():
+        for date in dates:
+            format_iso_date(date)
+        return size
+    return run
+
+
+def bench_create_sample_atoms(size: int, dynamodb) -> Callable[[], int]:
+    from add_sample_atoms import create_sample_atoms
+
+    def run():
+        return len(create_sample_atoms('bench-user', size))
+    return run
+
+
+def bench_create_sample_notes(size: int, dynamodb) -> Callable[[], int]:
+    import add_sample_data
+
+    with quiet():
+        users = add_sample_data.create_sample_users(max(1, size // 100))
+
+    def run():
+        with quiet():
+            return len(add_sample_data.create_sample_notes(users, max(1, size // len(users))))
+    return run
+
+
+def bench_create_sample_atoms_for_users(size: int, dynamodb) -> Callable[[], int]:
+    import add_sample_data
+
+    users = [{'UserId': {'S': f'user-{i:03d}'}} for i in range(100)]
+    notes = make_notes(max(len(users), size // 10), len(users))
+
+    def run():
+        return len(add_sample_data.create_sample_atoms(users, notes, max(1, size // len(users))))
+    return run
+
+
+def bench_put_atoms(size: int, dynamodb) -> Callable[[], int]:
+    from add_sample_atoms import create_sample_atoms, put_atoms
+
+    table_name = BENCH_TABLE_PREFIX + 'Atoms'
+    create_bench_table(dynamodb, table_name, ['atom_id'])
+    atoms = create_sample_atoms('bench-user', size)
+
+    def run():
+        with quiet():
+            written = put_atoms(dynamodb, table_name, atoms)
+        # put_atoms logs and skips failed items; a short count means the run failed
+        if written != len(atoms):
+            raise RuntimeError(f"put_atoms wrote {written} of {len(atoms)} atoms to {table_name}")
+        return written
+    return run
+
+
+def bench_put_notes(size: int, dynamodb) -> Callable[[], int]:
+    from add_sample_data import put_notes
+
+    table_name = BENCH_TABLE_PREFIX + 'Notes'
+    create_bench_table(dynamodb, table_name, ['NoteId', 'UserId'])
+    notes = make_notes(size, 100)
+
+    def run():
+        with quiet():
+            written = put_notes(dynamodb, table_name, notes)
+        # put_notes logs and skips failed items; a short count means the run failed
+        if written != len(notes):
+            raise RuntimeError(f"put_notes wrote {written} of {len(notes)} notes to {table_name}")
+        return written
+    return run
+
+
+def bench_verify_notes(size: int, dynamodb) -> Callable[[], int]:
+    from verify_notes import verify_notes
+
+    table_name = BENCH_TABLE_PREFIX + 'Notes'
+    create_bench_table(dynamodb, table_name, ['NoteId', 'UserId'])
+    seed_table(dynamodb, table_name, make_notes(size, 100))
+
+    def run():
+        with quiet():
+            counted = verify_notes(table_name, dynamodb)
+        if counted is None:
+            raise RuntimeError(f"verify_notes failed on {table_name}")
+        return counted
+    return run
+
+
+BENCHMARKS = {
+    'format_iso_date': {'setup': bench_format_iso_date, 'needs_dynamodb': False},
+    'create_sample_atoms': {'setup': bench_create_sample_atoms, 'needs_dynamodb': False},
+    'create_sample_notes': {'setup': bench_create_sample_notes, 'needs_dynamodb': False},
+    'create_sample_atoms_for_users': {'setup': bench_create_sample_atoms_for_users, 'needs_dynamodb': False},
+    'put_atoms': {'setup': bench_put_atoms, 'needs_dynamodb': True},
+    'put_notes': {'setup': bench_put_notes, 'needs_dynamodb': True},
+    'verify_notes': {'setup': bench_verify_notes, 'needs_dynamodb': True},
+}
+
+
+def run_single(name: str, size: int, repeat: int, measure_allocations: bool) -> Dict[str, Any]:
+    """Run one benchmark in this process and measure it."""
+    dynamodb = None
+    if BENCHMARKS[name]['needs_dynamodb']:
+        from dynamo_client import get_dynamodb_client
+        dynamodb = get_dynamodb_client(record_trace=False)
+
+    run = BENCHMARKS[name]['setup'](size, dynamodb)
+    gc.collect()
+    # Memory held by the setup data is the baseline, not part of the benchmark
+    baseline_rss_kb = read_status_kb('VmRSS') or peak_rss_kb()
+    reset_peak_rss()
+
+    # Each sample calls run() until it has taken MIN_SAMPLE_SECONDS, doubling
+    # the number of calls like timeit's autorange. The best sample is kept;
+    # long runs are stable enough to time once.
+    elapsed = None
+    loops = 1
+    for _ in range(repeat):
+        while True:
+            started = time.perf_counter()
+            for _ in range(loops):
+                items = run()
+            duration = time.perf_counter() - started
+            if duration >= MIN_SAMPLE_SECONDS:
+                break
+            loops *= 2
+        per_run = duration / loops
+        elapsed = per_run if elapsed is None else min(elapsed, per_run)
+        if duration > STABLE_RUN_SECONDS:
+            break
+    result = {
+        'benchmark': name,
+        'size': size,
+        'items': items,
+        'loops': loops,
+        'seconds': elapsed,
+        'throughput': items / elapsed if elapsed else 0.0,
+    }
+    peak = peak_rss_kb()
+    if peak is not None and baseline_rss_kb is not None:
+        result['baseline_rss_kb'] = baseline_rss_kb
+        result['peak_rss_kb'] = max(0, peak - baseline_rss_kb)
+
+    if measure_allocations:
+        # Second pass under tracemalloc, which would otherwise distort the timing
+        gc.collect()
+        blocks_before = sys.getallocatedblocks()
+        tracemalloc.start()
+        run()
+        result['alloc_peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        result['alloc_blocks_retained'] = sys.getallocatedblocks() - blocks_before
+    return result
+
+
+def run_isolated(name: str, size: int, repeat: int, measure_allocations: bool,
+                 endpoint_url: Optional[str]) -> Dict[str, Any]:
+    """Run one benchmark in a fresh interpreter so peak RSS belongs to it alone."""
+    command = [sys.executable, os.path.abspath(__file__), '_single', name, str(size), '--repeat', str(repeat)]
+    if not measure_allocations:
+        command.append('--no-allocations')
+    env = dict(os.environ)
+    if endpoint_url:
+        env['DYNAMODB_ENDPOINT_URL'] = endpoint_url
+    completed = subprocess.run(command, capture_output=True, text=True, env=env,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()
+        return {'benchmark': name, 'size': size, 'error': error[-1] if error else 'failed'}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def load_history(path: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def save_history(path: str, history: List[Dict[str, Any]]):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as handle:
+        json.dump(history, handle, indent=2)
+    os.replace(tmp_path, path)
+
+
+def print_results(results: List[Dict[str, Any]]):
+    print(f"\n{'Benchmark':<32} {'size':>9} {'seconds':>9} {'items/s':>12} {'peak RSS MB':>12} {'alloc peak MB':>14}")
+    print("-" * 92)
+    for result in results:
+        if 'error' in result:
+            print(f"{result['benchmark']:<32} {result['size']:>9}  failed: {result['error']}")
+            continue
+        rss = result.get('peak_rss_kb')
+        rss_text = f"{rss / 1024:>12.1f}" if rss is not None else f"{'-':>12}"
+        alloc = result.get('alloc_peak_bytes')
+        alloc_text = f"{alloc / 1024 ** 2:>14.1f}" if alloc is not None else f"{'-':>14}"
+        print(f"{result['benchmark']:<32} {result['size']:>9} {result['seconds']:>9.3f} "
+              f"{result['throughput']:>12,.0f} {rss_text} {alloc_text}")
+
+
+def run_benchmarks(args) -> int:
+    names = args.bench or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(unknown)}. Available: {', '.join(BENCHMARKS)}")
+        return 1
+
+    results = []
+    for name in names:
+        if BENCHMARKS[name]['needs_dynamodb'] and not args.endpoint_url:
+            log_message(f"Skipping {name}: needs --endpoint-url of a local DynamoDB")
+            continue
+        for size in args.sizes:
+            log_message(f"Running {name} at {size} items...")
+            results.append(run_isolated(name, size, args.repeat, not args.no_allocations, args.endpoint_url))
+
+    print_results(results)
+    history = load_history(args.history)
+    history.append({
+        'label': args.label,
+        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'commit': git_commit(),
+        'python': sys.version.split()[0],
+        'results': results,
+    })
+    save_history(args.history, history)
+    log_message(f"Recorded run #{len(history) - 1} in {args.history}")
+
+    failures = [result for result in results if 'error' in result]
+    if failures:
+        log_message(f"{len(failures)} benchmark(s) failed")
+        return 1
+    return 0
+
+
+def find_run(history: List[Dict[str, Any]], selector: str) -> Dict[str, Any]:
+    """Pick a run by index (negative counts from the end) or by label."""
+    try:
+        return history[int(selector)]
+    except ValueError:
+        for run in reversed(history):
+            if run.get('label') == selector:
+                return run
+    raise SystemExit(f"No run matches '{selector}'")
+
+
+def compare_runs(args) -> int:
+    """Flag metrics that got worse by more than the threshold between two runs."""
+    history = load_history(args.history)
+    if len(history) < 2:
+        print("Need at least two recorded runs to compare.")
+        return 1
+    baseline = find_run(history, args.baseline)
+    candidate = find_run(history, args.candidate)
+    baseline_results = {(result['benchmark'], result['size']): result for result in baseline['results']}
+
+    print(f"Comparing {candidate.get('label') or candidate['timestamp']} ({candidate.get('commit')}) "
+          f"against {baseline.get('label') or baseline['timestamp']} ({baseline.get('commit')})")
+    print(f"\n{'Benchmark':<32} {'size':>9} {'metric':<18} {'baseline':>14} {'candidate':>14} {'change':>9}")
+    print("-" * 100)
+
+    regressions = 0
+    candidate_keys = set()
+    for result in candidate['results']:
+        candidate_keys.add((result['benchmark'], result['size']))
+        previous = baseline_results.get((result['benchmark'], result['size']))
+        if 'error' in result:
+            print(f"{result['benchmark']:<32} {result['size']:>9} FAILED: {result['error']}")
+            regressions += 1
+            continue
+        if previous is None or 'error' in previous:
+            print(f"{result['benchmark']:<32} {result['size']:>9} no baseline to compare against")
+            continue
+        for metric, higher_is_better in HIGHER_IS_BETTER.items():
+            if metric not in result or not previous.get(metric):
+                continue
+            change = 100.0 * (result[metric] - previous[metric]) / previous[metric]
+            worse = -change if higher_is_better else change
+            flag = ''
+            if worse > args.threshold:
+                flag = '  REGRESSION'
+                regressions += 1
+            print(f"{result['benchmark']:<32} {result['size']:>9} {metric:<18} {previous[metric]:>14,.1f} "
+                  f"{result[metric]:>14,.1f} {change:>+8.1f}%{flag}")
+
+    # Benchmarks the baseline ran but the candidate didn't (skipped or lost)
+    for benchmark, size in baseline_results:
+        if (benchmark, size) not in candidate_keys:
+            print(f"{benchmark:<32} {size:>9} MISSING from the candidate run")
+            regressions += 1
+
+    print(f"\n{regressions} problem(s): regressions beyond {args.threshold:g}%, failed or missing benchmarks")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the backend scripts and track regressions.')
+    parser.add_argument('--history', default=HISTORY_FILE, help='JSON file of recorded runs')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run benchmarks and record the results')
+    run_parser.add_argument('--bench', nargs='+', help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    run_parser.add_argument('--endpoint-url', default=os.getenv('DYNAMODB_ENDPOINT_URL'),
+                            help='Local DynamoDB for the put and scan benchmarks, e.g. http://localhost:8000')
+    run_parser.add_argument('--label', help='Name for this run, usable with compare')
+    run_parser.add_argument('--repeat', type=int, default=3, help='Timed samples per benchmark; the fastest is kept')
+    run_parser.add_argument('--no-allocations', action='store_true', help='Skip the tracemalloc pass')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two recorded runs')
+    compare_parser.add_argument('--baseline', default='-2', help='Run index or label (default: second to last)')
+    compare_parser.add_argument('--candidate', default='-1', help='Run index or label (default: last)')
+    compare_parser.add_argument('--threshold', type=float, default=10.0, help='Allowed change in percent')
+
+    single_parser = subparsers.add_parser('_single')
+    single_parser.add_argument('name')
+    single_parser.add_argument('size', type=int)
+    single_parser.add_argument('--repeat', type=int, default=1)
+    single_parser.add_argument('--no-allocations', action='store_true')
+
+    args = parser.parse_args()
+    if args.command == '_single':
+        print(json.dumps(run_single(args.name, args.size, args.repeat, not args.no_allocations)))
+        return 0
+    if args.command == 'run':
+        return run_benchmarks(args)
+    return compare_runs(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
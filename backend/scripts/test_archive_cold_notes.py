@@ -0,0 +1,104 @@
+import os
+import time
+
+import botocore.session
+from botocore.stub import ANY, Stubber
+
+from archive_cold_notes import TABLE_NAME, read_cold_file, restore_cold_notes, tier_archived_notes, write_cold_file
+
+OLD = str(int(time.time()) - 200 * 86400)
+
+
+def make_client():
+    return botocore.session.get_session().create_client(
+        'dynamodb', region_name='us-east-1',
+        aws_access_key_id='testing', aws_secret_access_key='testing'
+    )
+
+
+def note(note_id, user_id='user-1', updated_at=OLD):
+    return {
+        'NoteId': {'S': note_id},
+        'UserId': {'S': user_id},
+        'Title': {'S': f'Title of {note_id}'},
+        'IsArchived': {'BOOL': True},
+        'UpdatedAt': {'N': updated_at},
+    }
+
+
+def expected_delete(item):
+    return {
+        'TableName': TABLE_NAME,
+        'Key': {'NoteId': item['NoteId'], 'UserId': item['UserId']},
+        'ConditionExpression': 'IsArchived = :archived AND UpdatedAt = :scanned',
+        'ExpressionAttributeValues': {':archived': {'BOOL': True}, ':scanned': item['UpdatedAt']},
+        'ReturnConsumedCapacity': 'TOTAL',
+    }
+
+
+def cold_notes(cold_dir, user_id):
+    user_dir = os.path.join(cold_dir, user_id)
+    if not os.path.isdir(user_dir):
+        return []
+    return [
+        item['NoteId']['S']
+        for file_name in sorted(os.listdir(user_dir))
+        for item in read_cold_file(os.path.join(user_dir, file_name))
+    ]
+
+
+def test_tier_keeps_notes_that_changed_since_the_scan(tmp_path):
+    cold_dir = str(tmp_path)
+    items = [note('n1'), note('n2'), note('n3', user_id='user-2')]
+    dynamodb = make_client()
+    with Stubber(dynamodb) as stubber:
+        stubber.add_response('scan', {'Items': items}, {
+            'TableName': TABLE_NAME, 'FilterExpression': ANY,
+            'ExpressionAttributeValues': ANY, 'Limit': 500,
+        })
+        stubber.add_response('delete_item', {'ConsumedCapacity': {'CapacityUnits': 1.0}}, expected_delete(items[0]))
+        # n2 was un-archived between the scan and the delete
+        stubber.add_client_error('delete_item', service_error_code='ConditionalCheckFailedException',
+                                 expected_params=expected_delete(items[1]))
+        stubber.add_response('delete_item', {'ConsumedCapacity': {'CapacityUnits': 1.0}}, expected_delete(items[2]))
+        result = tier_archived_notes(dynamodb, cold_dir, 90, 0, 500, dry_run=False)
+        stubber.assert_no_pending_responses()
+
+    assert result == {'notes': 3, 'users': 2, 'deleted': 2, 'hot_again': 1}
+    assert cold_notes(cold_dir, 'user-1') == ['n1']
+    assert cold_notes(cold_dir, 'user-2') == ['n3']
+
+
+def test_tier_dry_run_writes_and_deletes_nothing(tmp_path):
+    cold_dir = str(tmp_path / 'cold')
+    dynamodb = make_client()
+    with Stubber(dynamodb) as stubber:
+        stubber.add_response('scan', {'Items': [note('n1'), note('n2')]})
+        result = tier_archived_notes(dynamodb, cold_dir, 90, 0, 500, dry_run=True)
+        stubber.assert_no_pending_responses()
+
+    assert result == {'notes': 2, 'users': 1, 'deleted': 0, 'hot_again': 0}
+    assert not os.path.exists(cold_dir)
+
+
+def test_restore_never_overwrites_a_note_still_in_the_table(tmp_path):
+    cold_dir = str(tmp_path)
+    os.makedirs(os.path.join(cold_dir, 'user-1'))
+    path = os.path.join(cold_dir, 'user-1', 'notes-20250101T000000Z.jsonl.gz')
+    write_cold_file(path, [note('n1'), note('n2'), note('n3')])
+
+    dynamodb = make_client()
+    with Stubber(dynamodb) as stubber:
+        stubber.add_response('put_item', {}, {
+            'TableName': TABLE_NAME, 'Item': note('n1'),
+            'ConditionExpression': 'attribute_not_exists(NoteId)',
+            'ReturnConsumedCapacity': 'TOTAL',
+        })
+        # n2 is still in the table, e.g. after an interrupted tier run
+        stubber.add_client_error('put_item', service_error_code='ConditionalCheckFailedException')
+        restored = restore_cold_notes(dynamodb, cold_dir, 'user-1', ['n1', 'n2'], unarchive=False, max_wcu=0)
+        stubber.assert_no_pending_responses()
+
+    assert restored == 1
+    # Both requested notes leave the cold file; n3 was not requested
+    assert read_cold_file(path) == [note('n3')]
@@ -0,0 +1,134 @@
+import json
+
+import botocore.session
+import pytest
+from botocore.config import Config
+from botocore.exceptions import ClientError, EndpointConnectionError
+from botocore.stub import Stubber
+
+from dynamo_trace import (
+    HEADER, KIND_STRING, OP_RECORD, STATUS_ERROR, STATUS_OK, STATUS_THROTTLED, STRING_RECORD,
+    TraceReader, TraceRecord, TraceWriter, attach_recorder, in_start_order,
+)
+
+
+def make_client(**kwargs):
+    return botocore.session.get_session().create_client(
+        'dynamodb', region_name='us-east-1',
+        aws_access_key_id='testing', aws_secret_access_key='testing', **kwargs
+    )
+
+
+def count_string_records(path):
+    """Walk the raw file and count string records."""
+    records = list(TraceReader(path))
+    with open(path, 'rb') as handle:
+        data = handle.read()
+    offset = HEADER.size
+    strings = 0
+    for record in records:
+        # String records sit between op records; skip over them to reach the next op
+        while data[offset] == KIND_STRING:
+            _, _, length = STRING_RECORD.unpack_from(data, offset)
+            offset += STRING_RECORD.size + length
+            strings += 1
+        offset += OP_RECORD.size + len(record.payload)
+    return strings
+
+
+def test_writer_reader_round_trip(tmp_path):
+    path = str(tmp_path / 'calls.trc')
+    writer = TraceWriter(path)
+    origin = writer.origin_ns
+    writer.write('GetItem', 'Notes', None, origin + 1000, origin + 3_000_000, STATUS_OK, 120,
+                 {'Key': {'NoteId': {'S': 'n1'}, 'UserId': {'S': 'u1'}}})
+    writer.write('Query', 'Notes', 'UserIdIndex', origin + 2000, origin + 5_000_000, STATUS_THROTTLED, 0,
+                 {'KeyConditionExpression': 'UserId = :u'})
+    writer.write('GetItem', 'Notes', None, origin + 4000, origin + 4_500_000, STATUS_ERROR, 0, {})
+    writer.close()
+
+    records = list(TraceReader(path))
+    assert [record.op for record in records] == ['GetItem', 'Query', 'GetItem']
+    assert [record.table for record in records] == ['Notes'] * 3
+    assert [record.index for record in records] == [None, 'UserIdIndex', None]
+    assert [record.status for record in records] == [STATUS_OK, STATUS_THROTTLED, STATUS_ERROR]
+    first = records[0]
+    assert first.start_ns == 1000
+    assert first.end_ns == 1000 + 2_999_000  # Durations are stored in whole microseconds
+    assert first.item_size == 120
+    assert json.loads(first.payload) == {'Key': {'NoteId': {'S': 'n1'}, 'UserId': {'S': 'u1'}}}
+    # 'Notes' and 'UserIdIndex' are each written once
+    assert count_string_records(path) == 2
+
+
+def test_reader_rejects_other_files(tmp_path):
+    path = tmp_path / 'not-a-trace'
+    path.write_bytes(b'x' * HEADER.size)
+    with pytest.raises(ValueError):
+        TraceReader(str(path))
+
+
+def test_in_start_order_sorts_out_of_order_completions():
+    def record(start_ms, end_ms):
+        return TraceRecord('GetItem', 'Notes', None, start_ms * 10 ** 6, end_ms * 10 ** 6, STATUS_OK, 0, b'')
+
+    # Completion order, as the writer stores them; the slow call started first
+    completed = [record(5, 6), record(2, 7), record(0, 9), record(8, 10), record(9, 30)]
+    ordered = list(in_start_order(completed, window_ns=20 * 10 ** 6))
+    assert [r.start_ns // 10 ** 6 for r in ordered] == [0, 2, 5, 8, 9]
+
+
+def test_recorder_stores_keys_from_the_live_key_schema(tmp_path):
+    path = str(tmp_path / 'calls.trc')
+    dynamodb = make_client()
+    writer = attach_recorder(dynamodb, path)
+    item = {'pk': {'S': 'a'}, 'sk': {'S': 'b'}, 'Body': {'S': 'x' * 50}}
+    with Stubber(dynamodb) as stubber:
+        stubber.add_response('put_item', {})
+        stubber.add_response('describe_table', {'Table': {'KeySchema': [
+            {'AttributeName': 'pk', 'KeyType': 'HASH'},
+            {'AttributeName': 'sk', 'KeyType': 'RANGE'},
+        ]}}, {'TableName': 'bench-Items'})
+        stubber.add_response('put_item', {})
+        stubber.add_response('scan', {'Items': [], 'Count': 0})
+        dynamodb.put_item(TableName='bench-Items', Item=item)
+        dynamodb.put_item(TableName='bench-Items', Item=item)  # Key schema is cached
+        dynamodb.scan(TableName='bench-Items', ExclusiveStartKey={'pk': {'S': 'a'}, 'sk': {'S': 'b'}})
+        stubber.assert_no_pending_responses()
+    writer.close()
+
+    records = list(TraceReader(path))
+    # The describe_table lookup is not part of the trace
+    assert [record.op for record in records] == ['PutItem', 'PutItem', 'Scan']
+    for record in records[:2]:
+        assert json.loads(record.payload) == {'Key': {'pk': {'S': 'a'}, 'sk': {'S': 'b'}}}
+        assert record.item_size == 2 + 1 + 2 + 1 + 4 + 50
+    assert json.loads(records[2].payload) == {'ExclusiveStartKey': {'pk': {'S': 'a'}, 'sk': {'S': 'b'}}}
+
+
+def test_recorder_marks_throttled_calls(tmp_path):
+    path = str(tmp_path / 'calls.trc')
+    dynamodb = make_client()
+    writer = attach_recorder(dynamodb, path)
+    with Stubber(dynamodb) as stubber:
+        stubber.add_client_error('get_item', service_error_code='ProvisionedThroughputExceededException')
+        with pytest.raises(ClientError):
+            dynamodb.get_item(TableName='Notes', Key={'NoteId': {'S': 'n1'}, 'UserId': {'S': 'u1'}})
+    writer.close()
+
+    [record] = list(TraceReader(path))
+    assert (record.op, record.status) == ('GetItem', STATUS_THROTTLED)
+
+
+def test_recorder_keeps_transport_errors(tmp_path):
+    path = str(tmp_path / 'calls.trc')
+    # Nothing listens on the discard port, so the call fails before any response
+    dynamodb = make_client(endpoint_url='http://127.0.0.1:9',
+                           config=Config(retries={'total_max_attempts': 1}, connect_timeout=1))
+    writer = attach_recorder(dynamodb, path)
+    with pytest.raises(EndpointConnectionError):
+        dynamodb.get_item(TableName='Notes', Key={'NoteId': {'S': 'n1'}, 'UserId': {'S': 'u1'}})
+    writer.close()
+
+    [record] = list(TraceReader(path))
+    assert (record.op, record.table, record.status) == ('GetItem', 'Notes', STATUS_ERROR)
@@ -1,26 +1,30 @@
-import boto3
+from dynamo_client import get_dynamodb_client
 
-def verify_notes():
-    # Initialize a DynamoDB client
-    dynamodb = boto3.client('dynamodb')
+def verify_notes(table_name='Notes', dynamodb=None):
+    # Initialize a DynamoDB client unless the caller passes one
+    if dynamodb is None:
+        dynamodb = get_dynamodb_client()
     
     try:
-        # First, get the count of items in the table
-        count_response = dynamodb.scan(
-            TableName='Notes',
-            Select='COUNT'
-        )
+        # First, get the count of items in the table; a scan stops after 1 MB per page
+        total_items = 0
+        scan_kwargs = {'TableName': table_name, 'Select': 'COUNT'}
+        while True:
+            count_response = dynamodb.scan(**scan_kwargs)
+            total_items += count_response.get('Count', 0)
+            if 'LastEvaluatedKey' not in count_response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = count_response['LastEvaluatedKey']
         
-        total_items = count_response.get('Count', 0)
-        print(f"Total items in Notes table: {total_items}")
+        print(f"Total items in {table_name} table: {total_items}")
         
         # Now get a few sample items
         if total_items > 0:
-            print("\nSample items from Notes table:")
+            print(f"\nSample items from {table_name} table:")
             print("=" * 80)
             
             scan_response = dynamodb.scan(
-                TableName='Notes',
+                TableName=table_name,
                 Limit=min(5, total_items)  # Get up to 5 items
             )
             
@@ -40,7 +44,7 @@ def verify_notes():
         
         # Try to find a note with our pattern (note-user-XXX-000)
         scan_response = dynamodb.scan(
-            TableName='Notes',
+            TableName=table_name,
             FilterExpression='begins_with(NoteId, :prefix)',
             ExpressionAttributeValues={
                 ':prefix': {'S': 'note-user-'}
@@ -56,6 +60,7 @@ def verify_notes():
         else:
             print("No sample notes found with the expected pattern.")
         
+        return total_items
     except Exception as e:
         print(f"Error: {str(e)}")
         if hasattr(e, 'response') and 'Error' in e.response: